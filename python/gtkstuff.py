@@ -647,9 +647,11 @@ def timeout_add(interval, callback, *args, **kwargs):
     return data
 
 
-def timeout_add_seconds(interval, callback, *args, **kwargs):
+def timeout_add_seconds(interval, callback, *args,
+                        priority=GLib.PRIORITY_DEFAULT, **kwargs):
     data = [True, callback, args, kwargs]
-    data.append(GLib.timeout_add_seconds(interval, _source_wrapper, data))
+    data.append(GLib.timeout_add_seconds(interval, _source_wrapper, data,
+                                         priority=priority))
     return data
 
 
@@ -19,16 +19,23 @@
 import os
 import sys
 import subprocess
+import shlex
+import shutil
 import configparser
 import socket
+import select
 import pickle
+import struct
 import signal
 import time
+import re
 import gettext
 import itertools
+import operator
+import functools
 import collections
+import concurrent.futures
 import json
-import uuid
 import ctypes
 from binascii import hexlify, unhexlify
 
@@ -70,6 +77,61 @@ link_uuid_reg = LinkUUIDRegistry()
 
 METER_TEXT_SIZE = 8000
 
+# Field layout of the mixer settings record sent with ACTN=mixstats.
+MIXR_FORMAT = ":%03d:%03d:%03d:%03d:%03d:%03d:%03d:%03d:%03d:" \
+    "%d:%d%d%d%d%d:%d%d:%d%d%d%d:%d:%d:%d:%d:%d:%f:%f:" \
+    "%d:%f:%d:%d:%d:%d:%d:%d:%d:%03d:%f:"
+
+# The textual form of the track UUIDs stored in the playlists.
+UUID_RE = re.compile(r"\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+                     r"[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z")
+# Crossfader positions of the buttons that move it straight to a mark.
+CROSSFADER_MARKS = {"cfmleft": 0, "cfmmidl": 48, "cfmmidr": 52,
+                    "cfmright": 100}
+# A length prefixed field of the song name data sent by the players.
+SONGNAME_FIELD = re.compile(r"d(\d+):")
+# Characters that make a command line need /bin/sh to interpret it.
+SHELL_METACHARS = frozenset(";&|$<>*?\"'`\\~#(){}[]!\n")
+
+
+@functools.lru_cache(maxsize=8)
+def _size_attrs(size):
+    """A shared attribute list that sets the font size of a whole label."""
+
+    attrlist = Pango.AttrList()
+    attrlist.insert(Pango.attr_size_new(size))
+    return attrlist
+
+
+@functools.lru_cache(maxsize=256)
+def _markup_attrs(size, text):
+    """The attribute list of some sized markup, parsed once per unique pair."""
+    return Pango.parse_markup(
+        '<span size="{}">{}</span>'.format(size, text), -1, "0")[1]
+
+
+@functools.lru_cache(maxsize=1024)
+def format_song(artist, title, album):
+    """The display form of a track, bracketing the album name."""
+
+    o, c = ("[", "]") if "(" in album or ")" in album else ("(", ")")
+    return "%s - %s - %s%s%s" % (artist, title, o, album, c)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_pixbuf(path, width=None, height=None, preserve_aspect=True):
+    """Decode an image file once and share the pixbuf between widgets.
+
+    The image is scaled as it loads when a size is given, filling that size
+    exactly unless preserve_aspect is set.
+    """
+
+    if width is None:
+        return GdkPixbuf.Pixbuf.new_from_file(path)
+    if preserve_aspect:
+        return GdkPixbuf.Pixbuf.new_from_file_at_size(path, width, height)
+    return GdkPixbuf.Pixbuf.new_from_file_at_scale(path, width, height, False)
+
 
 class FreewheelButton(Gtk.Button):
     LED = LEDDict(9)
@@ -607,13 +669,7 @@ class MicButton(Gtk.ToggleButton):
 
         self.ca1 = make_indicator()
 
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                ""
-            ),
-            -1,
-            "0")[1]
+        attrlist = _markup_attrs(METER_TEXT_SIZE, "")
 
         lvbox = Gtk.VBox()
         hbox.pack_start(lvbox, False, False, 0)
@@ -860,6 +916,9 @@ class OpenerTab(Gtk.VBox):
 
         self.shell_on_open = Gtk.Entry()
         self.shell_on_close = Gtk.Entry()
+        for entry in (self.shell_on_open, self.shell_on_close):
+            self._cb_shell_changed(entry)
+            entry.connect("changed", self._cb_shell_changed)
         ivbox.pack_start(enbox(_('On open'), self.shell_on_open),
                          False, False, 0)
         ivbox.pack_start(
@@ -884,6 +943,20 @@ class OpenerTab(Gtk.VBox):
 
         self.button_was_on = False
 
+    @staticmethod
+    def _cb_shell_changed(entry):
+        """Pre-split commands that can be run without a shell."""
+
+        cmd = entry.get_text().strip()
+        argv = None
+        if not SHELL_METACHARS.intersection(cmd):
+            argv = shlex.split(cmd)
+            # An environment variable assignment prefix or a shell builtin
+            # such as cd or export needs the shell.
+            if argv and ("=" in argv[0] or shutil.which(argv[0]) is None):
+                argv = None
+        entry.argv = argv
+
     def set_ident(self, ident):
         self.label.set_text(str(ident))
         self.ident = ident
@@ -967,6 +1040,7 @@ class OpenerSettings(Gtk.Frame):
 
         self.notebook = Gtk.Notebook()
         vbox.pack_start(self.notebook, False, False, 3)
+        self._tabs = []
         self.show_all()
 
         self.activedict = {
@@ -984,26 +1058,29 @@ class OpenerSettings(Gtk.Frame):
         }
 
     def add_channel(self):
-        tab = OpenerTab(len(self.notebook) + 1)
+        tab = OpenerTab(len(self._tabs) + 1)
         self.notebook.append_page(tab, tab.label)
+        self._tabs.append(tab)
 
-        def add_closer(each_tab):
+        for each_tab in self._tabs:
             each_tab.add_closer(tab.ident)
 
-        self.notebook.foreach(add_closer)
         tab.show_all()
         tab.connect("changed", lambda w: self.emit("changed", tab))
 
     def finalise(self):
         for tab in self.notebook.get_children():
+            suffix = "_%d" % tab.ident
             for attrname in ("activedict", "valuesdict", "textdict"):
                 dest = getattr(self, attrname)
                 src = getattr(tab, attrname)
-                for key, val in src.items():
-                    dest[key + "_%d" % tab.ident] = val
+                dest.update((key + suffix, val) for key, val in src.items())
 
 
 class MicOpener(Gtk.Box):
+    FLASH_INTERVAL = 700
+    FLASH_IDLE_INTERVAL = 2000
+    FLASH_IDLE_TICKS = 5
 
     @property
     def any_mic_selected(self):
@@ -1024,7 +1101,7 @@ class MicOpener(Gtk.Box):
 
         if button.get_active():
             fwc = button.opener_tab.freewheel_cancel.get_active()
-            cmd = button.opener_tab.shell_on_open.get_text().strip()
+            entry = button.opener_tab.shell_on_open
             closers = button.opener_tab.closer_hbox.get_children()
             for i, closer in enumerate(closers, start=1):
                 if closer.get_active():
@@ -1033,13 +1110,21 @@ class MicOpener(Gtk.Box):
                     except KeyError:
                         pass
         else:
-            cmd = button.opener_tab.shell_on_close.get_text().strip()
+            entry = button.opener_tab.shell_on_close
 
+        cmd = entry.get_text().strip()
         if cmd and not button.block_shell_command:
             print("button %d shell command: %s" % (
                 button.opener_tab.ident, cmd
             ))
-            subprocess.Popen(cmd, shell=True, close_fds=True)
+            if entry.argv is not None:
+                try:
+                    subprocess.Popen(entry.argv, close_fds=True)
+                    cmd = None
+                except OSError as e:
+                    print("direct run failed, using the shell:", e)
+            if cmd is not None:
+                subprocess.Popen(cmd, shell=True, close_fds=True)
 
         for mic in mics:
             mic.open.set_active(button.get_active())
@@ -1057,14 +1142,38 @@ class MicOpener(Gtk.Box):
         self.notify_others(freewheel_cancel=fwc)
 
     def cb_reconfigure(self, widget, trigger=None):
+        signature = self._button_set_signature()
+        # Opener settings changes always rebuild since they alter the
+        # buttons themselves. Channel notifications that leave the
+        # grouping unchanged are often spurious and need no rebuild.
+        if widget is not self.opener_settings and \
+                signature == self._button_set_sig:
+            return
+
+        self._button_set_sig = signature
         self.new_button_set()
 
+    def _button_set_signature(self):
+        """The opener group of each channel, 0 for none."""
+
+        sig = []
+        for m in self.mic_list:
+            mode = m.mode.get_active()
+            group = 0
+            if mode:
+                pm = m.partner if mode == 3 else m
+                if pm.group.get_active():
+                    group = int(pm.groups_adj.get_value())
+            sig.append(group)
+        return tuple(sig)
+
     def new_button_set(self):
         # Clear away old button widgets.
         self.foreach(lambda x: x.destroy())
         self.mic2button = {}
         self.buttons = []
         self.ix2button = {}
+        self._last_flash_value = False
 
         mic_group_list = [[] for x in range(PGlobs.num_micpairs * 2)]
         aux_group_list = [[] for x in range(PGlobs.num_micpairs * 2)]
@@ -1143,28 +1252,45 @@ class MicOpener(Gtk.Box):
             l.show()
 
         # Categorisation of channels according to type a or m (aux or mic)
-        channel_modes = ['a' for i in range(PGlobs.num_micpairs * 2)]
-        for button in mic_group_list:
-            for channel in button:
-                channel_modes[channel.index] = 'm'
+        channel_modes = bytearray(b'a') * (PGlobs.num_micpairs * 2)
+        for channel in itertools.chain.from_iterable(mic_group_list):
+            channel_modes[channel.index] = ord('m')
 
         self.approot.mixer_write("CMOD=%s\nACTN=new_channel_mode_string\nend\n"
-                                 % "".join(channel_modes))
+                                 % channel_modes.decode("ascii"))
         self.notify_others()
 
+    def _start_flash_timeout(self, interval):
+        self._flash_interval = interval
+        self._flash_timeout = timeout_add(interval, self.cb_flash_timeout)
+
     @threadslock
     def cb_flash_timeout(self):
 
         if self._flash_test() and not self._forced_on_mode:
             self._flashing_timer += 1
+            self._flash_idle_ticks = 0
         else:
             self._flashing_timer = 0
+            self._flash_idle_ticks += 1
 
         flash_value = bool((self._flashing_timer % 2)
                            if self._flashing_timer > 7 else 0)
 
-        for mb in self.buttons:
-            mb.flash = flash_value
+        # Button redraws are only needed when the flash state changes.
+        if flash_value != self._last_flash_value:
+            self._last_flash_value = flash_value
+            for mb in self.buttons:
+                mb.flash = flash_value
+
+        # Poll less often while there is nothing to flash for.
+        if self._flash_idle_ticks > self.FLASH_IDLE_TICKS:
+            interval = self.FLASH_IDLE_INTERVAL
+        else:
+            interval = self.FLASH_INTERVAL
+        if interval != self._flash_interval:
+            self._start_flash_timeout(interval)
+            return False
 
         return True
 
@@ -1192,17 +1318,18 @@ class MicOpener(Gtk.Box):
     def oc(self, mic, val):
         """Perform open/close."""
 
-        try:
-            self.mic2button[mic].set_active(val)
-        except:
-            for m in self.mic_list:
-                if mic == m.ui_name:
-                    mode = m.mode.get_active()
-                    if mode in (1, 2):
-                        m.open.set_active(val)
-                    elif mode == 3:
-                        m.partner.open.set_active(val)
-                    break
+        mb = self.mic2button.get(mic)
+        if mb is not None:
+            mb.set_active(val)
+            return
+
+        m = self._mic_by_name.get(mic)
+        if m is not None:
+            mode = m.mode.get_active()
+            if mode in (1, 2):
+                m.open.set_active(val)
+            elif mode == 3:
+                m.partner.open.set_active(val)
 
     def get_opener_button(self, ix):
         try:
@@ -1234,6 +1361,8 @@ class MicOpener(Gtk.Box):
 
         self.opener_settings.add_channel()
         self.mic_list.append(mic)
+        # First registration wins, as with the linear search this replaces.
+        self._mic_by_name.setdefault(mic.ui_name, mic)
         for attr, sig in zip(
             ("mode", "group", "no_front_panel_opener", "groups_adj"),
                 ("changed", "toggled", "toggled", "notify::value")):
@@ -1249,15 +1378,19 @@ class MicOpener(Gtk.Box):
         self.set_spacing(2)
         self.set_homogeneous(True)
         self.mic_list = []
+        self._mic_by_name = {}
+        self._button_set_sig = None
         self.buttons = []
         self.mic2button = {}
         self._any_mic_selected = False
         self._forced_on_mode = False
         self._flashing_mode = False
         self._flashing_timer = 0
+        self._flash_idle_ticks = 0
+        self._last_flash_value = False
         self._headroom = 0.0
-        timeout = timeout_add(700, self.cb_flash_timeout)
-        self.connect("destroy", lambda w: source_remove(timeout))
+        self._start_flash_timeout(self.FLASH_INTERVAL)
+        self.connect("destroy", lambda w: source_remove(self._flash_timeout))
         self.opener_settings = OpenerSettings()
         self.opener_settings.connect("changed", self.cb_reconfigure)
 
@@ -1272,25 +1405,22 @@ class PaddedVBox(Gtk.VBox):
 
     def __init__(self, l, t, r, b, s):
         super(PaddedVBox, self).__init__()
+        self.freeze_child_notify()
         d = Gtk.VBox()
         self.pack_start(d, False, False, t)
-        d.show()
         d = Gtk.VBox()
         self.pack_end(d, False, False, b)
-        d.show()
         h = Gtk.Box()
         self.pack_start(h, True, True, 0)
-        h.show()
         d = Gtk.VBox()
         h.pack_start(d, False, False, l)
-        d.show()
         d = Gtk.VBox()
         h.pack_end(d, False, False, r)
-        d.show()
         self.vbox = Gtk.VBox()
         self.vbox.set_spacing(s)
         h.pack_start(self.vbox, True, True, 0)
-        self.vbox.show()
+        self.thaw_child_notify()
+        self.show_all()
         self.pack_start = self.vbox_pack_start
         self.add = self.vbox_add
 
@@ -1310,14 +1440,7 @@ def make_meter_scale():         # A logarithmic meter scale for a 'VU' meter
 
     for lbl, align in lbls.items():
         label = Gtk.Label(label=lbl)
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                lbl
-            ),
-            -1,
-            "0")[1]
-        label.set_attributes(attrlist)
+        label.set_attributes(_size_attrs(METER_TEXT_SIZE))
         alignment = Gtk.Alignment.new(*align)
         alignment.add(label)
         label.show()
@@ -1327,6 +1450,22 @@ def make_meter_scale():         # A logarithmic meter scale for a 'VU' meter
     return scalebox
 
 
+def make_level_adjustment():
+    """A 0-127 level adjustment starting at the 0dB mid point."""
+
+    return Gtk.Adjustment(64.0, 0.0, 127.0, 1.0, 6.0)
+
+
+def make_meter_label(box, text):
+    """Add a label to box in the meter text size."""
+
+    label = Gtk.Label(label=text)
+    label.set_attributes(_size_attrs(METER_TEXT_SIZE))
+    box.add(label)
+    label.show()
+    return label
+
+
 def make_meter_unit(text, l_meter, r_meter):
     mic_peak_box = Gtk.VBox()
     mic_peak_box.set_border_width(0)
@@ -1336,14 +1475,7 @@ def make_meter_unit(text, l_meter, r_meter):
     hbox.set_border_width(1)
     frame.add(hbox)
     label = Gtk.Label(label=text)
-    attrlist = Pango.parse_markup(
-        '<span size="{}">{}</span>'.format(
-            METER_TEXT_SIZE,
-            text
-        ),
-        -1,
-        "0")[1]
-    label.set_attributes(attrlist)
+    label.set_attributes(_size_attrs(METER_TEXT_SIZE))
     labelbox = Gtk.Box()
     labelbox.add(label)
     label.show()
@@ -1366,42 +1498,28 @@ def make_meter_unit(text, l_meter, r_meter):
 
 def make_stream_meter_unit(text, meters):
     outer_vbox = Gtk.VBox()
+    outer_vbox.freeze_child_notify()
     outer_vbox.set_border_width(0)
     frame = Gtk.Frame()
     frame.set_border_width(4)
     inner_vbox = Gtk.VBox()
     frame.add(inner_vbox)
     label = Gtk.Label(label=text)
-    attrlist = Pango.parse_markup(
-        '<span size="{}">{}</span>'.format(
-            METER_TEXT_SIZE,
-            text
-        ),
-        -1,
-        "0")[1]
-    label.set_attributes(attrlist)
+    label.set_attributes(_size_attrs(METER_TEXT_SIZE))
     labelbox = Gtk.Box()
     labelbox.add(label)
-    label.show()
     outer_vbox.pack_start(labelbox, False, False, 0)
-    labelbox.show()
     outer_vbox.pack_start(frame, False, False, 0)
-    frame.show()
-    inner_vbox.show()
     for num, meter in enumerate(meters):
         hbox = Gtk.Box()
         hbox.set_border_width(1)
         hbox.set_spacing(1)
         inner_vbox.add(hbox)
-        hbox.show()
         label = Gtk.Label(label=str(num + 1))
         hbox.pack_start(label, False, False, 0)
-        label.show()
         vbox = Gtk.VBox()
         vbox.pack_start(meter, True, True, 2)
-        meter.show()
         hbox.pack_start(vbox, True, True, 0)
-        vbox.show()
     set_tip(
         frame,
         _('This indicates the state of the various streams. Flashing'
@@ -1416,35 +1534,37 @@ def make_stream_meter_unit(text, meters):
         FGlobs.pkgdatadir / "listenerphones.png", 20, 16)
     image = Gtk.Image.new_from_pixbuf(pixbuf)
     frame.set_label_widget(image)
-    image.show()
 
     frame.set_border_width(4)
     inner_vbox = Gtk.VBox()
     frame.add(inner_vbox)
-    inner_vbox.show()
     connections = Gtk.Label(label="0")
     inner_vbox.add(connections)
-    connections.show()
     outer_vbox.pack_start(frame, False, False, 0)
-    frame.show()
     set_tip(frame,
             _('The combined total number of listeners in all server tabs.'))
 
+    outer_vbox.thaw_child_notify()
+    outer_vbox.show_all()
     return outer_vbox, connections
 
 
+def rgba_tuple(spec):
+    """Parse a colour specification into a Cairo RGBA source tuple."""
+
+    colour = Gdk.RGBA()
+    colour.parse(spec)
+    return colour.red, colour.green, colour.blue, colour.alpha
+
+
 class StreamMeter(Gtk.Frame):
 
     """Main panel meter showing stream status and buffer fill."""
 
     def realize(self, widget):
-        self.green = Gdk.RGBA()
-        self.red = Gdk.RGBA()
-        self.grey = Gdk.RGBA()
-
-        self.green.parse("#30D030")
-        self.red.parse("#D05044")
-        self.grey.parse("darkgray")
+        self.green = rgba_tuple("#30D030")
+        self.red = rgba_tuple("#D05044")
+        self.grey = rgba_tuple("darkgray")
 
     def expose(self, widget, event):
         if not self.da.get_realized():
@@ -1452,16 +1572,16 @@ class StreamMeter(Gtk.Frame):
 
         ctx = Gdk.cairo_create(self.da.get_window())
         if self.flash or not self.active:
-            Gdk.cairo_set_source_rgba(ctx, self.grey)
+            ctx.set_source_rgba(*self.grey)
             ctx.rectangle(0, 0, self.rect.width, self.rect.height)
             ctx.fill()
         else:
             valuep = int(float(self.value - self.base) /
                          float(self.top - self.base) * self.rect.width)
-            Gdk.cairo_set_source_rgba(ctx, self.red)
+            ctx.set_source_rgba(*self.red)
             ctx.rectangle(0, 0, valuep, self.rect.height)
             ctx.fill()
-            Gdk.cairo_set_source_rgba(ctx, self.green)
+            ctx.set_source_rgba(*self.green)
             ctx.rectangle(valuep, 0,
                           self.rect.width - valuep, self.rect.height)
             ctx.fill()
@@ -1493,8 +1613,16 @@ class StreamMeter(Gtk.Frame):
             self.invalidate()
 
     def invalidate(self):
+        # Coalesce to at most one invalidation per main loop iteration.
+        if not self._pending_invalidate:
+            self._pending_invalidate = True
+            idle_add(self._do_invalidate)
+
+    def _do_invalidate(self):
+        self._pending_invalidate = False
         if self.da.get_realized() and self.da.get_window():
             self.da.get_window().invalidate_rect(self.rect, False)
+        return False
 
     def __init__(self, base, top):
         self.base = base
@@ -1512,6 +1640,7 @@ class StreamMeter(Gtk.Frame):
         self.value = self.oldvalue = self.base
         self.active = False
         self.flash = False
+        self._pending_invalidate = False
 
 
 class BasicMeter(Gtk.Frame):
@@ -1519,17 +1648,11 @@ class BasicMeter(Gtk.Frame):
     """A meter widget with a simple rectangular vertical bar."""
 
     def realize(self, widget):
-        self.lowc = Gdk.RGBA()
-        self.midc = Gdk.RGBA()
-        self.highc = Gdk.RGBA()
-        self.backc = Gdk.RGBA()
-        self.linec = Gdk.RGBA()
-
-        self.lowc.parse("#30D030")
-        self.midc.parse("#CCCF44")
-        self.highc.parse("#D05044")
-        self.backc.parse("darkgray")
-        self.linec.parse("#505050")
+        self.lowc = rgba_tuple("#30D030")
+        self.midc = rgba_tuple("#CCCF44")
+        self.highc = rgba_tuple("#D05044")
+        self.backc = rgba_tuple("darkgray")
+        self.linec = rgba_tuple("#505050")
 
     def expose(self, widget, event):
         self.oldvalue = self.top
@@ -1560,12 +1683,12 @@ class BasicMeter(Gtk.Frame):
             Gtk.render_background(self.da.get_style_context(), ctx,
                                   0, 0, self.width, self.height)
             if value < self.oldvalue:
-                Gdk.cairo_set_source_rgba(ctx, self.backc)
+                ctx.set_source_rgba(*self.backc)
                 ctx.rectangle(0, 0, self.width, self.height - valuep)
                 ctx.fill()
             if value > self.oldvalue:
                 if valuep > self.mutp:
-                    Gdk.cairo_set_source_rgba(ctx, self.highc)
+                    ctx.set_source_rgba(*self.highc)
                     ctx.rectangle(
                         0,
                         self.height - valuep,
@@ -1574,7 +1697,7 @@ class BasicMeter(Gtk.Frame):
                     ctx.fill()
                     valuep = self.mutp
                 if valuep > self.lutp:
-                    Gdk.cairo_set_source_rgba(ctx, self.midc)
+                    ctx.set_source_rgba(*self.midc)
                     ctx.rectangle(
                         0,
                         self.height - valuep,
@@ -1583,13 +1706,13 @@ class BasicMeter(Gtk.Frame):
                     ctx.fill()
                     valuep = self.lutp
                 if valuep > 0:
-                    Gdk.cairo_set_source_rgba(ctx, self.lowc)
+                    ctx.set_source_rgba(*self.lowc)
                     ctx.rectangle(0, self.height - valuep, self.width, valuep)
                     ctx.fill()
             if self.line is not None:
                 valuel = int(self.height * float(self.line - self.base) /
                              float(self.top - self.base))
-                Gdk.cairo_set_source_rgba(ctx, self.linec)
+                ctx.set_source_rgba(*self.linec)
                 ctx.move_to(0, self.height - valuel)
                 ctx.line_to(self.width, self.height - valuel)
                 ctx.stroke()
@@ -1657,21 +1780,13 @@ class StackedMeter(Gtk.Frame):
         self.uh = self.height / float(self.top - self.base)
 
     def set_meter_value(self, c, d, n, force=False):
-        if not force and (self.c == c and self.d == d and self.n == n):
+        if not force and (self.c, self.d, self.n) == (c, d, n):
             # Values not changed from last time so no need to redraw.
             return
-        if c < self.base:
-            c = self.base
-        if d < self.base:
-            d = self.base
-        if n < self.base:
-            n = self.base
-        if c > self.top:
-            c = self.top
-        if d > self.top:
-            d = self.top
-        if n > self.top:
-            n = self.top
+        base, top = self.base, self.top
+        c = min(top, max(base, c))
+        d = min(top, max(base, d))
+        n = min(top, max(base, n))
         self.c = c
         self.d = d
         self.n = n
@@ -1721,26 +1836,23 @@ class vumeter(BasicMeter):
 
     """A VU meter that needs to be fed values at 50ms intervals."""
 
+    # Newest first.
+    weights = (5, 6, 4, 3, 2, 1)
+
     def set_meter_value(self, newvalue):
         if newvalue > self.scale:
             newvalue = self.scale
 
-        self.gen6 = self.gen5
-        self.gen5 = self.gen4
-        self.gen4 = self.gen3
-        self.gen3 = self.gen2
-        self.gen2 = self.gen1
-        self.gen1 = newvalue
+        self.gens.appendleft(newvalue)
 
         # Weighted mean over 300ms.
-        newvalue = (5 * self.gen1 + 6 * self.gen2 + 4 * self.gen3 +
-                    3 * self.gen4 + 2 * self.gen5 + self.gen6) / 21
+        newvalue = sum(g * w for g, w in zip(self.gens, self.weights)) / 21
         BasicMeter.set_value(self, -newvalue)
 
     def __init__(self):
         BasicMeter.__init__(self, -36, 0, -12, -7)
         self.scale = 36
-        self.gen1 = self.gen2 = self.gen3 = self.gen4 = self.gen5 = self.scale
+        self.gens = collections.deque([self.scale] * 6, maxlen=6)
 
 
 class peakholdmeter(BasicMeter):
@@ -1768,6 +1880,8 @@ class peakholdmeter(BasicMeter):
 
 
 class MicMeter(Gtk.VBox):
+    LED_ON = FGlobs.pkgdatadir / "led_lit_green_black_border_64x64.png"
+    LED_OFF = FGlobs.pkgdatadir / "led_unlit_clear_border_64x64.png"
 
     def set_meter_value(self, newvals):
         gain, red, yellow, green = (int(x) for x in newvals.split(","))
@@ -1811,23 +1925,15 @@ class MicMeter(Gtk.VBox):
         lhbox.add(pad)
         pad.show()
         lhbox.set_spacing(2)
-        self.led_onpb = GdkPixbuf.Pixbuf.new_from_file_at_size(
-            FGlobs.pkgdatadir / "led_lit_green_black_border_64x64.png", 7, 7)
-        self.led_offpb = GdkPixbuf.Pixbuf.new_from_file_at_size(
-            FGlobs.pkgdatadir / "led_unlit_clear_border_64x64.png", 7, 7)
+        self.led_onpb = _load_pixbuf(self.LED_ON, 7, 7)
+        self.led_offpb = _load_pixbuf(self.LED_OFF, 7, 7)
         self.led = Gtk.Image()
         lhbox.pack_start(self.led, False, False, 0)
         self.set_led(False)
         self.led.show()
         labeltext = labelbasetext + " " + str(index)
         label = Gtk.Label(label=labeltext)
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                labeltext
-            ),
-            -1,
-            "0")[1]
+        attrlist = _markup_attrs(METER_TEXT_SIZE, labeltext)
         label.set_attributes(attrlist)
         lhbox.pack_start(label, False, False, 0)
         label.show()
@@ -1865,6 +1971,15 @@ class MicMeter(Gtk.VBox):
         self.set_has_tooltip(True)
 
 
+def _meter_pair_showhide(widget, state, box, l, r):
+    """Show the box of a mic meter pair while either meter is sensitive."""
+
+    if l.is_sensitive() or r.is_sensitive():
+        box.show()
+    else:
+        box.hide()
+
+
 class RecIndicator(Gtk.Box):
     colour = "clear", "red", "amber"
 
@@ -1876,19 +1991,13 @@ class RecIndicator(Gtk.Box):
         label = Gtk.Label(label=label_text)
         self.pack_start(label, True, True, 0)
         label.show()
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                ""
-            ),
-            -1,
-            "0")[1]
+        attrlist = _markup_attrs(METER_TEXT_SIZE, "")
         label.set_attributes(attrlist)
         self.image = Gtk.Image()
         self.pack_start(self.image, False, False, 0)
         self.image.show()
 
-        self.led = [GdkPixbuf.Pixbuf.new_from_file_at_size(
+        self.led = [_load_pixbuf(
             FGlobs.pkgdatadir / (which + ".png"), 9, 9) for which in (
             "led_unlit_clear_border_64x64", "led_lit_red_black_border_64x64",
             "led_lit_amber_black_border_64x64")]
@@ -1902,13 +2011,7 @@ class RecordingPanel(Gtk.VBox):
 
         # TC: Record as in, to make a recording.
         label = Gtk.Label(label=" %s " % _('Record'))
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                _('Record')
-            ),
-            -1,
-            "0")[1]
+        attrlist = _markup_attrs(METER_TEXT_SIZE, _('Record'))
         label.set_attributes(attrlist)
         self.pack_start(label, True, True, 0)
         label.show()
@@ -1957,6 +2060,17 @@ class idjc_shutdown_dialog:
 
     def __init__(self, window_group=None, actionyes=None, actionno=None,
                  additional_text=None):
+        self.window_group = window_group
+        self.actionyes = actionyes
+        self.actionno = actionno
+        self.additional_text = additional_text
+
+    def show(self):
+        window_group = self.window_group
+        actionyes = self.actionyes
+        actionno = self.actionno
+        additional_text = self.additional_text
+
         dialog = Gtk.Dialog(
             pm.title_extra.strip(),
             None,
@@ -1998,93 +2112,295 @@ class idjc_shutdown_dialog:
         dialog.show_all()
 
 
+# Files played are stored as a count then, for each, the pathname length,
+# the time it was played and the UTF-8 pathname.
+FILES_PLAYED_MAGIC = b"IDJC-FP1"
+FILES_PLAYED_COUNT = struct.Struct("<I")
+FILES_PLAYED_ENTRY = struct.Struct("<Id")
+
+
+def pack_files_played(files_played):
+    """Serialise a {pathname: time played} dictionary."""
+
+    parts = [FILES_PLAYED_MAGIC, FILES_PLAYED_COUNT.pack(len(files_played))]
+    pack = FILES_PLAYED_ENTRY.pack
+    for pathname, when in files_played.items():
+        pathname = pathname.encode("utf-8", "surrogateescape")
+        parts.append(pack(len(pathname), when))
+        parts.append(pathname)
+    return b"".join(parts)
+
+
+def unpack_files_played(data):
+    """The inverse of pack_files_played."""
+
+    offset = len(FILES_PLAYED_MAGIC)
+    count, = FILES_PLAYED_COUNT.unpack_from(data, offset)
+    offset += FILES_PLAYED_COUNT.size
+    unpack_from = FILES_PLAYED_ENTRY.unpack_from
+    entry_size = FILES_PLAYED_ENTRY.size
+    files_played = {}
+    for i in range(count):
+        length, when = unpack_from(data, offset)
+        offset += entry_size
+        pathname = data[offset:offset + length]
+        offset += length
+        files_played[pathname.decode("utf-8", "surrogateescape")] = when
+    return files_played
+
+
+def write_session_history(session_filename, recent, text):
+    """Write the files played and tracks played parts of the main session."""
+
+    # Each file is written aside and renamed into place so a crash mid-write
+    # leaves the previous copy intact.
+    try:
+        path = session_filename + "_files_played"
+        with open(path + ".tmp", "wb") as fh:
+            fh.write(pack_files_played(recent))
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        print("Error writing out main session data", e)
+
+    try:
+        path = session_filename + "_tracks"
+        fd = os.open(path + ".tmp",
+                     os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, text)
+        finally:
+            os.close(fd)
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        print("Error writing out tracks played data", e)
+
+
+# Values the mixer reports, as (attribute path from the main window, initial
+# value, mixer report key). Each is created as a SlotObject and, when it has
+# a key, entered in the vumap.
+MIXER_SLOTS = (
+    ("jingles_playing", 0, "jingles_playing"),
+    ("interlude_playing", 0, None),
+    ("player_left.playtime_elapsed", 0, "left_elapsed"),
+    ("player_right.playtime_elapsed", 0, "right_elapsed"),
+    ("jingles.interlude.playtime_elapsed", 0, "interlude_elapsed"),
+    ("player_left.mixer_playing", 0, "left_playing"),
+    ("player_right.mixer_playing", 0, "right_playing"),
+    ("jingles.interlude.mixer_playing", 0, "interlude_playing"),
+    ("player_left.mixer_signal_f", 0, "left_signal"),
+    ("player_right.mixer_signal_f", 0, "right_signal"),
+    ("jingles.interlude.mixer_signal_f", 0, "interlude_signal"),
+    ("player_left.mixer_cid", 0, "left_cid"),
+    ("player_right.mixer_cid", 0, "right_cid"),
+    ("jingles.interlude.mixer_cid", 0, "interlude_cid"),
+    ("left_compression_level", 0, None),
+    ("right_compression_level", 0, None),
+    ("left_deess_level", 0, None),
+    ("right_deess_level", 0, None),
+    ("left_noisegate_level", 0, None),
+    ("right_noisegate_level", 0, None),
+    ("jingles.mixer_jingles_cid", 0, "jingles_cid"),
+    ("jingles.mixer_interlude_cid", 0, None),
+    ("player_left.runout", 0, "left_audio_runout"),
+    ("player_right.runout", 0, "right_audio_runout"),
+    ("jingles.interlude.runout", 0, "interlude_audio_runout"),
+    ("metadata_left_ctrl", 0, "left_additional_metadata"),
+    ("metadata_right_ctrl", 0, "right_additional_metadata"),
+    ("metadata_interlude_ctrl", 0, "interlude_additional_metadata"),
+    ("player_left.silence", 0.0, "left_silence"),
+    ("player_right.silence", 0.0, "right_silence"),
+    ("jingles.interlude.silence", 0.0, "interlude_silence"),
+    ("sample_rate", 0, "sample_rate"),
+    ("effects_playing", 0, "effects_playing"),
+)
+
+# Mixer report keys for the meters and widgets that are not SlotObjects.
+VUMAP_WIDGETS = (
+    ("str_l_peak", "str_l_peak"),
+    ("str_r_peak", "str_r_peak"),
+    ("str_l_rms", "str_l_rms_vu"),
+    ("str_r_rms", "str_r_rms_vu"),
+    ("freewheel_mode", "freewheel_button"),
+)
+
+
+def _restore_tracks_played(self, v):
+    if int(v):
+        self.history_expander.emit("activate")
+
+
+def _restore_shown(widget_path):
+    """A restore action that shows a window when its setting is 1."""
+
+    get_widget = operator.attrgetter(widget_path)
+
+    def restore(self, v):
+        if v == "1":
+            get_widget(self).show()
+    return restore
+
+
+# Actions that apply each main session file setting to the main window.
+RESTORE_DISPATCH = {
+    "deckvol": lambda self, v: self.deckadj.set_value(float(v)),
+    "deck2vol": lambda self, v: self.deck2adj.set_value(float(v)),
+    "crossfade": lambda self, v: self.crossadj.set_value(float(v)),
+    "stream_mon": lambda self, v: self.listen_stream.set_active(int(v)),
+    "tracks_played": _restore_tracks_played,
+    "pass_speed": lambda self, v: self.passspeed_adj.set_value(float(v)),
+    "prefs": _restore_shown("prefs_window.window"),
+    "server": _restore_shown("server_window.window"),
+    "jingles": _restore_shown("jingles"),
+    "prefspage": lambda self, v:
+        self.prefs_window.notebook.set_current_page(int(v)),
+    "metadata_src": lambda self, v: self.metadata_source.set_active(int(v)),
+    "crosstype": lambda self, v: self.crosspattern.set_active(int(v)),
+    "hpane": lambda self, v: self.paned.set_position(int(v)),
+    "vpane": lambda self, v: self.leftpane.set_position(int(v)),
+    "cw_tree": lambda self, v: self.topleftpane.set_col_widths("tree", v),
+    "cw_flat": lambda self, v: self.topleftpane.set_col_widths("flat", v),
+    "cw_catalogs": lambda self, v:
+        self.topleftpane.set_col_widths("catalogs", v),
+    "dbpage": lambda self, v:
+        self.topleftpane.notebook.set_current_page(int(v)),
+    "playerpage": lambda self, v: self.player_nb.set_current_page(int(v)),
+}
+
+
 class MainWindow(dbus.service.Object):
+    # Sent to the mixer on every meter update.
+    REQUEST_LEVELS = b"ACTN=requestlevels\nend\n"
+
+    # Metadata sources in the order of the metadata source selector.
+    METADATA_LEFT_DECK = 0
+    METADATA_RIGHT_DECK = 1
+    METADATA_LAST_PLAYED = 2
+    METADATA_CROSSFADER = 3
+    METADATA_NONE = 4
+    METADATA_BACKGROUND = 5
+
+    # VoIP mixer modes.
+    NO_PHONE = 0
+    PUBLIC_PHONE = 1
+    PRIVATE_PHONE = 2
 
     def send_new_mixer_stats(self):
+        if self._flush_drain is not None:
+            # Resend when the flush in progress has completed.
+            self._mixer_stats_resend = True
+            return
+
+        self._emit_mixer_stats()
+        self.alarm = False
+        if self._flush_pending():
+            self._flush_drain = timeout_add(50, self._cb_drain_flush)
+        else:
+            self._finish_mixer_stats()
+
+    def _flush_pending(self):
+        return self.player_left.flush or self.player_right.flush or \
+            self.jingles.flush or self.jingles.interludeflush
+
+    def _drain_flush(self, poll=True):
+        """Track player flushes. Returns True while any remain."""
+
+        if poll:
+            self.vu_update(False)
+        pl = self.player_left
+        pr = self.player_right
+        j = self.jingles
+        j.interludeflush &= self.interlude_playing.value
+        j.flush &= self.jingles_playing.value
+        pl.flush &= pl.mixer_playing.value
+        pr.flush &= pr.mixer_playing.value
+        if pl.flush or pr.flush or j.flush or j.interludeflush:
+            return True
+
+        self._flush_drain = None
+        self._finish_mixer_stats()
+        if self._mixer_stats_resend:
+            self._mixer_stats_resend = False
+            self.send_new_mixer_stats()
+        return False
+
+    @threadslock
+    def _cb_drain_flush(self):
+        # While the window is hidden the regular VU timeout alone keeps the
+        # playing states current.
+        return self._drain_flush(self._main_visible)
+
+    def _wait_for_flush(self):
+        """Complete a flush in progress without returning to the main loop."""
+
+        if self._flush_drain is not None:
+            source_remove(self._flush_drain)
+            while self._drain_flush():
+                time.sleep(0.05)
+
+    def _emit_mixer_stats(self):
+
+        pl = self.player_left
+        pr = self.player_right
+        j = self.jingles
+        il = j.interlude
+        pw = self.prefs_window
 
         deckadj = deck2adj = self.deckadj.get_value()
-        if self.prefs_window.dual_volume.get_active():
+        if pw.dual_volume.get_active():
             deck2adj = self.deck2adj.get_value()
 
-        string_to_send = ":%03d:%03d:%03d:%03d:%03d:%03d:%03d:%03d:%03d:" \
-            "%d:%d%d%d%d%d:%d%d:%d%d%d%d:%d:%d:%d:%d:%d:%f:%f:" \
-            "%d:%f:%d:%d:%d:%d:%d:%d:%d:%03d:%f:" % (
-                deckadj,
-                deck2adj,
-                self.crossadj.get_value(),
-                self.jingles.jvol_adj[0].get_value(),
-                self.jingles.jmute_adj[0].get_value(),
-                self.jingles.jvol_adj[1].get_value(),
-                self.jingles.jmute_adj[1].get_value(),
-                self.jingles.ivol_adj.get_value(),
-                self.mixbackadj.get_value(),
-                self.jingles.playing,
-                self.player_left.stream.get_active(),
-                self.player_left.listen.get_active(),
-                self.player_right.stream.get_active(),
-                self.player_right.listen.get_active(),
-                self.listen_stream.get_active(),
-                self.player_left.pause.get_active(),
-                self.player_right.pause.get_active(),
-                self.player_left.flush,
-                self.player_right.flush,
-                self.jingles.flush,
-                self.jingles.interludeflush,
-                self.simplemixer,
-                self.alarm,
-                self.mixermode,
-                True,
-                self.player_left.play.get_active() or
-                self.player_right.play.get_active(),
-                1.0 / self.player_left.pbspeedfactor,
-                1.0 / self.player_right.pbspeedfactor,
-                self.prefs_window.speed_variance.get_active(),
-                self.prefs_window.dj_aud_adj.get_value(),
-                self.crosspattern.get_active(),
-                self.dsp_button.get_active(),
-                self.jingles.interlude.pause.get_active(),
-                self.jingles.interlude.stream.get_active(),
-                self.jingles.interlude.listen.get_active(),
-                self.jingles.interlude.force.get_active(),
-                self.prefs_window.alarm_aud_adj.get_value(),
-                self.voipgainadj.get_value(),
-                1.0 / self.jingles.interlude.pbspeedfactor
-            )
+        string_to_send = MIXR_FORMAT % (
+            deckadj,
+            deck2adj,
+            self.crossadj.get_value(),
+            j.jvol_adj[0].get_value(),
+            j.jmute_adj[0].get_value(),
+            j.jvol_adj[1].get_value(),
+            j.jmute_adj[1].get_value(),
+            j.ivol_adj.get_value(),
+            self.mixbackadj.get_value(),
+            j.playing,
+            pl.stream.get_active(),
+            pl.listen.get_active(),
+            pr.stream.get_active(),
+            pr.listen.get_active(),
+            self.listen_stream.get_active(),
+            pl.pause.get_active(),
+            pr.pause.get_active(),
+            pl.flush,
+            pr.flush,
+            j.flush,
+            j.interludeflush,
+            self.simplemixer,
+            self.alarm,
+            self.mixermode,
+            True,
+            pl.play.get_active() or pr.play.get_active(),
+            1.0 / pl.pbspeedfactor,
+            1.0 / pr.pbspeedfactor,
+            pw.speed_variance.get_active(),
+            pw.dj_aud_adj.get_value(),
+            self.crosspattern.get_active(),
+            self.dsp_button.get_active(),
+            il.pause.get_active(),
+            il.stream.get_active(),
+            il.listen.get_active(),
+            il.force.get_active(),
+            pw.alarm_aud_adj.get_value(),
+            self.voipgainadj.get_value(),
+            1.0 / il.pbspeedfactor
+        )
+        # An identical record is redundant unless it raises an alarm or a
+        # flush, which the mixer acts on each time they are received.
+        if string_to_send == self._last_mixr and not self.alarm and \
+                not self._flush_pending():
+            return
         self.mixer_write("MIXR=%s\nACTN=mixstats\nend\n" % string_to_send)
+        self._last_mixr = string_to_send
 
-        self.alarm = False
-        while self.player_left.flush or self.player_right.flush or \
-                self.jingles.flush or self.jingles.interludeflush:
-            time.sleep(0.05)
-            self.vu_update(False)
-            self.jingles.interludeflush = self.jingles.interludeflush & \
-                self.interlude_playing.value
-            self.jingles.flush = self.jingles.flush & \
-                self.jingles_playing.value
-            self.player_left.flush = self.player_left.flush & \
-                self.player_left.mixer_playing.value
-            self.player_right.flush = self.player_right.flush & \
-                self.player_right.mixer_playing.value
-
+    def _finish_mixer_stats(self):
         # decide which metadata source to use (0 = left, 1 = right)
-        if self.metadata_src == self.METADATA_LEFT_DECK:
-            meta = 0
-        elif self.metadata_src == self.METADATA_RIGHT_DECK:
-            meta = 1
-        elif self.metadata_src == self.METADATA_LAST_PLAYED:
-            if self.last_player == "left":
-                meta = 0
-            else:
-                meta = 1
-        elif self.metadata_src == self.METADATA_CROSSFADER:
-            if self.crossadj.get_value() < 50:
-                meta = 0
-            else:
-                meta = 1
-        elif self.metadata_src == self.METADATA_NONE:
-            meta = -1
-        elif self.metadata_src == self.METADATA_BACKGROUND:
-            meta = 2
+        meta = self._meta_dispatch[self.metadata_src]()
 
         # get metadata from left (meta == 0) or right (meta == 1) player
         target = (self.player_left, self.player_right,
@@ -2113,15 +2429,8 @@ class MainWindow(dbus.service.Object):
             self.old_meta_context = meta_context
             if self.songname:
                 if target.element:
-                    if "(" in self.album or ")" in self.album:
-                        form = "%s - %s - [%s]"
-                    else:
-                        form = "%s - %s - (%s)"
-                    self.songname = form % (
-                        self.artist,
-                        self.title,
-                        self.album
-                    )
+                    self.songname = format_song(
+                        self.artist, self.title, self.album)
 
                 self.set_track_metadata(
                     self.artist,
@@ -2154,6 +2463,9 @@ class MainWindow(dbus.service.Object):
                          in_signature="sssssb")
     def set_track_metadata(self, artist, title, album, songname, filename, log):
         args = artist, title, album, songname, filename
+        unchanged = self._old_metadata_2 == args
+        if unchanged and not log:
+            return
 
         self.window.set_title("%s :: IDJC%s" % (songname,
                                                 pm.title_extra))
@@ -2161,19 +2473,18 @@ class MainWindow(dbus.service.Object):
             tm = time.localtime()
             ts = "%02d:%02d :: " % (tm[3], tm[4])  # hours and minutes
             tstext = str(songname)
-            self.history_buffer.place_cursor(
-                self.history_buffer.get_end_iter()
-            )
-            self.history_buffer.insert_at_cursor(ts + tstext + "\n")
-            adjustment = self.history_window.get_vadjustment()
-            adjustment.set_value(adjustment.get_upper())
-            try:
-                with open(pm.basedir / "history.log", "a") as f:
-                    f.write(time.strftime("%x %X :: ") + tstext + "\n")
-            except IOError:
-                print("failed to write log entry to history.log")
+            # A burst of entries is added to the buffer in one go when idle.
+            if not self._history_pending:
+                idle_add(self._cb_insert_history)
+            self._history_pending.append(ts + tstext + "\n")
+            if self._history_fh is not None:
+                try:
+                    self._history_fh.write(
+                        time.strftime("%x %X :: ", tm) + tstext + "\n")
+                except IOError:
+                    print("failed to write log entry to history.log")
 
-        if self._old_metadata_2 == args:
+        if unchanged:
             return
 
         self._old_metadata_2 = args
@@ -2181,6 +2492,21 @@ class MainWindow(dbus.service.Object):
         # Don't pass music_filename
         self.server_window.new_metadata(*args[:-1])
 
+    def _insert_history(self):
+        if self._history_pending:
+            self.history_buffer.place_cursor(
+                self.history_buffer.get_end_iter()
+            )
+            self.history_buffer.insert_at_cursor(
+                "".join(self._history_pending))
+            del self._history_pending[:]
+            adjustment = self.history_window.get_vadjustment()
+            adjustment.set_value(adjustment.get_upper())
+
+    @threadslock
+    def _cb_insert_history(self):
+        self._insert_history()
+
     @dbus.service.signal(dbus_interface=PGlobs.dbus_bus_basename,
                          signature="sssss")
     def track_metadata_changed(self, artist, title, album, songname,
@@ -2208,17 +2534,17 @@ class MainWindow(dbus.service.Object):
         self.channel_states[index] = is_open
 
     def songname_decode(self, data):
-        i = 1
+        pos = 0
         while 1:
-            if data[i - 1] != "d":
+            match = SONGNAME_FIELD.match(data, pos)
+            if match is None:
                 print("songname_decode: WARNING, read past end boundary")
                 yield None
                 continue
-            colon_index = data.index(":", i)
-            text_length = int(data[i: colon_index])
-            text = data[colon_index + 1: colon_index + 1 + text_length]
-            yield text
-            i = colon_index + text_length + 2
+            start = match.end()
+            end = start + int(match.group(1))
+            yield data[start:end]
+            pos = end + 1
 
     def update_songname(self, player, data):
         gen = self.songname_decode(data)
@@ -2229,6 +2555,12 @@ class MainWindow(dbus.service.Object):
         player_context = int(next(gen))
         time_lag = int(next(gen))
 
+        # Repeat notifications of the same track need no further work.
+        key = infotype, artist, title, album, player_context
+        if self._songname_keys.get(player) == key:
+            return
+        self._songname_keys[player] = key
+
         # if infotype in (1, 2):
         #    artist = artist.decode("utf-8")
         #    title = title.decode("utf-8")
@@ -2242,20 +2574,15 @@ class MainWindow(dbus.service.Object):
         # infotype = 1  # Chain
 
         if infotype == 1:
-            def fmt(artist, title, album):
-                o, c = ("[", "]") if "(" in album or ")" in album else (
-                    "(", ")")
-                return "%s - %s - %s%s%s" % (artist, title, o, album, c)
-
             if not album and not artist:
-                sep = title.count(" - ")
-                if sep == 2:
-                    artist, title, album = title.split(" - ")
-                elif sep == 1:
-                    artist, title = title.split(" - ")
+                parts = title.split(" - ")
+                if len(parts) == 3:
+                    artist, title, album = parts
+                elif len(parts) == 2:
+                    artist, title = parts
 
                 if artist and title and album:
-                    song = fmt(artist, title, album)
+                    song = format_song(artist, title, album)
                 elif artist and title:
                     song = " - ".join((artist, title))
                 else:
@@ -2263,7 +2590,7 @@ class MainWindow(dbus.service.Object):
             elif not album:
                 song = " - ".join((artist, title))
             else:
-                song = fmt(artist, title, album)
+                song = format_song(artist, title, album)
 
             #artist = artist.encode("utf-8")
             #title = title.encode("utf-8")
@@ -2329,53 +2656,63 @@ class MainWindow(dbus.service.Object):
 
     def callback(self, widget, data):
         print("%s was pressed" % data)
-        if data == "Show about":
-            self.prefs_window.notebook.set_current_page(4)
-            self.prefs_window.window.present()
-        if data == "Features":
-            if widget.get_active():
-                self.simplemixer = False
-                self.min_wst.set_tracking(False)
-                self.window.forall(self.ui_detail_leveller(5))
-                self.send_new_mixer_stats()
-                for each in (self.player_left, self.player_right):
-                    each.pl_mode.emit("changed")
-                self.full_wst.apply()
-                self.full_wst.set_tracking(True)
-            else:
-                self.simplemixer = True
-                self.full_wst.set_tracking(False)
-                self.player_right.stop.clicked()
-                self.crossadj.set_value(0)
-                self.crossadj.value_changed()
-                self.window.forall(self.ui_detail_leveller(0))
-                for each in (self.player_left, self.player_right):
-                    each.pl_delay.set_sensitive(False)
-                self.min_wst.apply()
-                self.min_wst.set_tracking(True)
-        if data == "Advance":
-            if self.crossfade.get_value() < 50:
-                self.player_left.advance()
-            else:
-                self.player_right.advance()
         if data.startswith("cfm"):
-            if self.crosspass:
-                source_remove(self.crosspass)
-                self.crosspass = 0
-            self.crossfade.set_value(data == "cfmright" and 100
-                                     or data == "cfmmidl" and 48
-                                     or data == "cfmmidr" and 52
-                                     or data == "cfmleft" and 0)
-        if data == "pass-crossfader":
-            if self.crosspass:
-                self.crossdirection = not self.crossdirection
-            else:
-                self.crossdirection = (self.crossadj.get_value() <= 50)
-                self.crosspass = timeout_add(
-                    int(self.passspeed_adj.get_value() * 10),
-                    self.cb_crosspass)
-        if data == "Clear History":
-            self.history_buffer.set_text("")
+            self._callback_cfm(widget, data)
+        else:
+            handler = self._callback_handlers.get(data)
+            if handler is not None:
+                handler(widget)
+
+    def _callback_show_about(self, widget):
+        self.prefs_window.notebook.set_current_page(4)
+        self.prefs_window.window.present()
+
+    def _callback_features(self, widget):
+        if widget.get_active():
+            self.simplemixer = False
+            self.min_wst.set_tracking(False)
+            self.window.forall(self.ui_detail_leveller(5))
+            self.send_new_mixer_stats()
+            for each in (self.player_left, self.player_right):
+                each.pl_mode.emit("changed")
+            self.full_wst.apply()
+            self.full_wst.set_tracking(True)
+        else:
+            self.simplemixer = True
+            self.full_wst.set_tracking(False)
+            self.player_right.stop.clicked()
+            self.crossadj.set_value(0)
+            self.crossadj.value_changed()
+            self.window.forall(self.ui_detail_leveller(0))
+            for each in (self.player_left, self.player_right):
+                each.pl_delay.set_sensitive(False)
+            self.min_wst.apply()
+            self.min_wst.set_tracking(True)
+
+    def _callback_advance(self, widget):
+        if self.crossfade.get_value() < 50:
+            self.player_left.advance()
+        else:
+            self.player_right.advance()
+
+    def _callback_cfm(self, widget, data):
+        if self.crosspass:
+            source_remove(self.crosspass)
+            self.crosspass = 0
+        self.crossfade.set_value(CROSSFADER_MARKS[data])
+
+    def _callback_pass_crossfader(self, widget):
+        if self.crosspass:
+            self.crossdirection = not self.crossdirection
+        else:
+            self.crossdirection = (self.crossadj.get_value() <= 50)
+            self.crosspass = timeout_add(
+                int(self.passspeed_adj.get_value() * 10),
+                self.cb_crosspass)
+
+    def _callback_clear_history(self, widget):
+        del self._history_pending[:]
+        self.history_buffer.set_text("")
 
     def expandercallback(self, expander, param_spec, user_data=None):
         if expander.get_expanded():
@@ -2393,10 +2730,7 @@ class MainWindow(dbus.service.Object):
         if x == 100 * self.crossdirection:
             self.crosspass = 0
             return False
-        if self.crossdirection:
-            self.crossfade.set_value(x + 1)
-        else:
-            self.crossfade.set_value(x - 1)
+        self.crossfade.set_value(x + (1 if self.crossdirection else -1))
         return True
 
     # handles selection of metadata source
@@ -2513,71 +2847,43 @@ class MainWindow(dbus.service.Object):
             return True
 
         try:
+            fields = (
+                ("deckvol", self.deckadj.get_value()),
+                ("deck2vol", self.deck2adj.get_value()),
+                ("crossfade", self.crossadj.get_value()),
+                ("stream_mon", int(self.listen_stream.get_active())),
+                ("tracks_played", int(self.history_expander.get_expanded())),
+                ("pass_speed", self.passspeed_adj.get_value()),
+                ("prefs", int(self.prefs_window.window.is_visible())),
+                ("server", int(self.prefs_window.window.is_visible())),
+                ("prefspage", self.prefs_window.notebook.get_current_page()),
+                ("metadata_src", self.metadata_source.get_active()),
+                ("crosstype", self.crosspattern.get_active()),
+                ("hpane", self.paned.get_position()),
+                ("vpane", self.leftpane.get_position()),
+                ("cw_tree", self.topleftpane.get_col_widths("tree")),
+                ("cw_flat", self.topleftpane.get_col_widths("flat")),
+                ("cw_catalogs", self.topleftpane.get_col_widths("catalogs")),
+                ("dbpage", self.topleftpane.notebook.get_current_page()),
+                ("playerpage", self.player_nb.get_current_page()),
+            )
             with open(session_filename, "w") as fh:
-                fh.write("deckvol=" + str(self.deckadj.get_value()) + "\n")
-                fh.write("deck2vol=" + str(self.deck2adj.get_value()) + "\n")
-                fh.write("crossfade=" + str(self.crossadj.get_value()) + "\n")
-                fh.write("stream_mon=" +
-                         str(int(self.listen_stream.get_active())) + "\n")
-                fh.write("tracks_played=" +
-                         str(int(self.history_expander.get_expanded())) + "\n")
-                fh.write("pass_speed=" +
-                         str(self.passspeed_adj.get_value()) + "\n")
-                fh.write(
-                    "prefs={}\n".format(
-                        int(self.prefs_window.window.is_visible())
-                    )
-                )
-                fh.write(
-                    "server={}\n".format(
-                        int(self.prefs_window.window.is_visible())
-                    )
-                )
-                fh.write("prefspage=" +
-                         str(self.prefs_window.notebook.get_current_page()) +
-                         "\n")
-                fh.write("metadata_src=" +
-                         str(self.metadata_source.get_active()) + "\n")
-                fh.write("crosstype=" +
-                         str(self.crosspattern.get_active()) + "\n")
-                fh.write("hpane=" +
-                         str(self.paned.get_position()) + "\n")
-                fh.write("vpane=" +
-                         str(self.leftpane.get_position()) + "\n")
-                fh.write("cw_tree=" +
-                         self.topleftpane.get_col_widths("tree") + "\n")
-                fh.write("cw_flat=" +
-                         self.topleftpane.get_col_widths("flat") + "\n")
-                fh.write("cw_catalogs=" +
-                         self.topleftpane.get_col_widths("catalogs") + "\n")
-                fh.write("dbpage=" +
-                         str(self.topleftpane.notebook.get_current_page()) +
-                         "\n")
-                fh.write("playerpage=" +
-                         str(self.player_nb.get_current_page()) + "\n")
-                fh.close()
-
-                # Save a list of files played and timestamps.
-                fh = open(session_filename + "_files_played", "wb")
-                cutoff = time.time() - 2592000  # 2592000 = 30 days.
-                recent = {}
-                for key, value in self.files_played.items():
-                    if value > cutoff:
-                        recent[key] = value
-                pickle.Pickler(fh).dump(recent)
-                fh.close()
-
+                fh.write("".join("%s=%s\n" % each for each in fields))
         except Exception as e:
             print("Error writing out main session data", e)
 
-        try:
-            fh = open(session_filename + "_tracks", "w")
-            start, end = self.history_buffer.get_bounds()
-            text = str(self.history_buffer.props.text)
-            fh.write(text)
-            fh.close()
-        except Exception as e:
-            print("Error writing out tracks played data", e)
+        # The files played and the track history are written by the save
+        # thread from snapshots taken here.
+        # cutoff is kept local as it is compared against every entry.
+        cutoff = time.time() - 2592000  # 2592000 = 30 days.
+        recent = {key: value for key, value in self.files_played.items()
+                  if value > cutoff}
+        self._insert_history()
+        text = self.history_buffer.props.text.encode("utf-8")
+        future = self._save_pool.submit(
+            write_session_history, session_filename, recent, text)
+        if trigger != "periodic":
+            future.result()
 
         self.prefs_window.save_player_prefs(where)
         self.controls.save_prefs(where)
@@ -2585,24 +2891,31 @@ class MainWindow(dbus.service.Object):
 
         # Build links directory when in session mode.
         if pm.profile is None:
-            link_uuid_reg.clear()
-            for row in itertools.chain(self.player_left.liststore,
-                                       self.player_right.liststore,
-                                       self.jingles.interlude.liststore):
-                uuid_ = row[10]
-                try:
-                    uuid.UUID(uuid_)
-                except:
-                    pass
-                else:
-                    link_uuid_reg.add(uuid_, row[1])
-
-            effects = self.jingles.all_effects
-            for uuid_, pathname in ((x.uuid, x.pathname) for x in effects):
-                if pathname is not None:
-                    link_uuid_reg.add(str(uuid_), pathname)
-
-            link_uuid_reg.update(PathStr(where or pm.basedir) / "links")
+            def links():
+                for store in (self.player_left.liststore,
+                              self.player_right.liststore,
+                              self.jingles.interlude.liststore):
+                    # Both columns of a row are fetched in one call.
+                    iter = store.get_iter_first()
+                    while iter is not None:
+                        yield store.get(iter, 10, 1)
+                        iter = store.iter_next(iter)
+                for effect in self.jingles.all_effects:
+                    if effect.pathname is not None:
+                        yield str(effect.uuid), effect.pathname
+
+            links_dir = PathStr(where or pm.basedir) / "links"
+            wanted = tuple((uuid_, pathname) for uuid_, pathname in links()
+                           if uuid_ and UUID_RE.match(uuid_))
+            # The links directory is only rebuilt when its content would
+            # differ from the last time.
+            if (links_dir, wanted) != self._last_links:
+                self._last_links = links_dir, wanted
+                link_uuid_reg.clear()
+                add = link_uuid_reg.add
+                for uuid_, pathname in wanted:
+                    add(uuid_, pathname)
+                link_uuid_reg.update(links_dir)
 
         self.player_left.save_session(where)
         self.player_right.save_session(where)
@@ -2613,78 +2926,44 @@ class MainWindow(dbus.service.Object):
 
     def restore_session(self):
         try:
-            fh = open(pm.basedir / self.session_filename, "r")
+            with open(pm.basedir / self.session_filename, "r") as fh:
+                lines = fh.read().splitlines()
         except Exception as e:
             print(e)
             return
-        while 1:
-            try:
-                line = fh.readline()
-                if line == "":
-                    break
-            except:
-                    break
-            k, _, v = line[:-1].partition('=')
-            if k == "deckvol":
-                self.deckadj.set_value(float(v))
-            elif k == "deck2vol":
-                self.deck2adj.set_value(float(v))
-            elif k == "crossfade":
-                self.crossadj.set_value(float(v))
-            elif k == "stream_mon":
-                self.listen_stream.set_active(int(v))
-            elif k == "tracks_played":
-                if int(line[14:-1]):
-                    self.history_expander.emit("activate")
-            elif k == "pass_speed":
-                self.passspeed_adj.set_value(float(v))
-            elif k == "prefs":
-                if v == "1":
-                    self.prefs_window.window.show()
-            elif k == "server":
-                if v == "1":
-                    self.server_window.window.show()
-            elif k == "jingles":
-                if v == "1":
-                    self.jingles.show()
-            elif k == "prefspage":
-                self.prefs_window.notebook.set_current_page(int(v))
-            elif k == "metadata_src":
-                self.metadata_source.set_active(int(v))
-            elif k == "crosstype":
-                self.crosspattern.set_active(int(v))
-            elif k == "hpane":
-                self.paned.set_position(int(v))
-            elif k == "vpane":
-                self.leftpane.set_position(int(v))
-            elif k in ("cw_tree", "cw_flat", "cw_catalogs"):
-                self.topleftpane.set_col_widths(k[3:], v)
-            elif k == "dbpage":
-                self.topleftpane.notebook.set_current_page(int(v))
-            elif k == "playerpage":
-                self.player_nb.set_current_page(int(v))
+        for line in lines:
+            k, _, v = line.partition('=')
+            handler = RESTORE_DISPATCH.get(k)
+            if handler is not None:
+                handler(self, v)
         try:
-            fh = open(self.session_filename + "_files_played", "r")
+            fh = open(self.session_filename + "_files_played", "rb")
         except:
             pass
         else:
-            self.files_played = pickle.Unpickler(fh).load()
-            fh.close()
+            with fh:
+                data = fh.read()
+            if data.startswith(FILES_PLAYED_MAGIC):
+                try:
+                    self.files_played = unpack_files_played(data)
+                except (struct.error, ValueError, UnicodeDecodeError) as e:
+                    print("files played data is corrupt:", e)
+                    self.files_played = {}
+            else:
+                # Written by an older version.
+                self.files_played = pickle.loads(data)
 
         mst = pm.basedir / (self.session_filename + "_tracks")
         try:
-            stat = os.stat(mst)
-        except OSError as e:
+            with open(mst, "r", encoding="utf-8", newline="") as fh:
+                if os.fstat(fh.fileno()).st_ctime + 21600 > time.time():
+                    text = fh.read()
+                else:
+                    text = None
+        except Exception as e:
             print(e)
             return
-        if stat.st_ctime + 21600 > time.time():
-            try:
-                fh = open(mst, "r")
-            except Exception as e:
-                print(e)
-                return
-            text = fh.read()
-            fh.close()
+        if text is not None:
             self.history_buffer.set_text(text)
         else:
             print("disregarding out of date track history text")
@@ -2701,12 +2980,13 @@ class MainWindow(dbus.service.Object):
         while Gdk.events_pending():
             Gtk.main_iteration()
 
-        time.sleep(0.3)
+        self._await_backend_exit(0.3)
         exit(5)
 
     def destroy(self, widget=None, data=None):
         self.freewheel_button.set_active(False)
         self.save_session("atexit")
+        self._save_pool.shutdown()
         if self.crosspass:
             source_remove(self.crosspass)
         self.server_window.cleanup()
@@ -2717,11 +2997,13 @@ class MainWindow(dbus.service.Object):
         self.player_left.flush = True
         self.player_right.flush = True
         self.send_new_mixer_stats()
+        self._wait_for_flush()
         self.prefs_window.songdbprefs.disconnect()
-        source_remove(self.statstimeout)
-        source_remove(self.vutimeout)
+        source_remove(self.ticktimeout)
         source_remove(self.savetimeout)
         self._mixer_ctrl.close()
+        if self._history_fh is not None:
+            self._history_fh.close()
         self.quitting()
         self.window.hide()
         self.prefs_window.window.hide()
@@ -2735,9 +3017,36 @@ class MainWindow(dbus.service.Object):
         while Gdk.events_pending():
             Gtk.main_iteration()
 
-        time.sleep(0.3)  # Allow time for all subthreads/programs time to exit
+        # Allow time for all subthreads/programs time to exit
+        self._await_backend_exit(0.3)
         exit(0)
 
+    def _await_backend_exit(self, timeout):
+        """Wait for the backend to close its reply pipe, up to timeout seconds.
+
+        The backend closes the pipe as its last act so end of file marks its
+        exit. The full timeout applies when there is no backend to wait for.
+        """
+
+        deadline = time.time() + timeout
+        try:
+            fd = self._mixer_rply.fileno()
+        except (AttributeError, ValueError):
+            fd = None
+        while 1:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            if fd is None:
+                time.sleep(remaining)
+                return
+            try:
+                readable = select.select([fd], [], [], remaining)[0]
+                if readable and not os.read(fd, 4096):
+                    return
+            except OSError:
+                fd = None
+
     @dbus.service.signal(dbus_interface=PGlobs.dbus_bus_basename, signature="")
     def quitting(self):
         """Called to notify plugins that this session is closing."""
@@ -2750,6 +3059,24 @@ class MainWindow(dbus.service.Object):
 
         pass
 
+    @threadslock
+    def _cb_tick(self):
+        """Poll the mixer levels and run the slower periodic checks."""
+
+        self._tick += 1
+        if not self.vu_update(False):
+            return False
+        if not self._tick % 2:
+            self.stats_update()
+        if not self._tick % 20:
+            self.heartbeat()
+        return True
+
+    @threadslock
+    def _cb_quit_signal(self):
+        self.destroy()
+        return True
+
     @dbus.service.signal(dbus_interface=PGlobs.dbus_bus_basename, signature="")
     def tracks_finishing(self):
         """Called to notify DJ that music tracks are ending."""
@@ -2777,17 +3104,29 @@ class MainWindow(dbus.service.Object):
             self.destroy()
             return False
 
-        idjc_shutdown_dialog(self.window_group, self.destroy, None, qm)
+        idjc_shutdown_dialog(self.window_group, self.destroy, None, qm).show()
         return True
 
     def mixer_write(self, message, target="mx"):
-        """The means to communicate with and launch the backend."""
+        """The means to communicate with and launch the backend.
+
+        The message may be given already encoded as bytes.
+        """
 
         if target is True or target is False or target is None:
             raise RuntimeError("want traceback")
         try:
-            self._mixer_ctrl.write("%s\n%s" % (target, message))
-            self._mixer_ctrl.flush()
+            # Unbuffered, straight to the pipe. fileno() raises ValueError
+            # once the stream is closed, as the buffered write did.
+            fd = self._mixer_ctrl.fileno()
+            if not isinstance(message, bytes):
+                message = message.encode("utf-8")
+            data = (target.encode("utf-8"), b"\n", message)
+            written = os.writev(fd, data)
+            if written < sum(map(len, data)):
+                rest = b"".join(data)[written:]
+                while rest:
+                    rest = rest[os.write(fd, rest):]
         except (IOError, ValueError, AttributeError) as e:
             if message == "bootstrap":
                 print("launching backend")
@@ -2827,6 +3166,7 @@ class MainWindow(dbus.service.Object):
 
                 if message != "bootstrap":
                     # Restore previous settings.
+                    self._last_mixr = None
                     self.send_new_mixer_stats()
                     self.prefs_window.mic_controls_backend_update()
                     self.prefs_window.voip_pan_backend_update()
@@ -2843,14 +3183,16 @@ class MainWindow(dbus.service.Object):
                 print("giving up")
                 self.destroy_hard()
 
-    def mixer_read(self, iters=0):
-        if iters == 5:
+    def mixer_read(self):
+        for attempt in range(5):
+            try:
+                line = self._mixer_rply.readline()
+            except IOError as e:
+                print(str(e))
+            else:
+                break
+        else:
             self.destroy_hard()
-        try:
-            line = self._mixer_rply.readline()
-        except IOError as e:
-            print(str(e))
-            line = self.mixer_read(iters + 1)
         if line == "Segmentation Fault\n":
             line = ""
             print("Mixer reports a segmentation fault")
@@ -2858,7 +3200,7 @@ class MainWindow(dbus.service.Object):
             self._mixer_ctrl.close()
         return line
 
-    def vu_update(self, locking=True, vu_update_counter=[0]):
+    def vu_update(self, locking=True):
         session_ns = {}
         player_metadata = []
         midis = ''
@@ -2868,29 +3210,26 @@ class MainWindow(dbus.service.Object):
             if not Gtk.main_level():
                 return False
 
-            vu_update_counter[0] += 1
-            if vu_update_counter[0] % 20 == 0:
-                self.heartbeat()
-
             try:
-                self.mixer_write("ACTN=requestlevels\nend\n")
+                self.mixer_write(self.REQUEST_LEVELS)
             except (ValueError, IOError):
                 return True
 
+            read = self.mixer_read
+            vumap = self.vumap
             while 1:
-                line = self.mixer_read().rstrip()
+                line = read().rstrip()
                 if line == "":
                     return True
 
                 if line == "end":
                     break
 
-                if not line.count("="):
+                key, sep, value = line.partition("=")
+                if not sep:
                     print(line)
                     continue
 
-                key, value = line.split("=", 1)
-
                 if key == "midi":
                     midis = value
                     continue
@@ -2926,11 +3265,9 @@ class MainWindow(dbus.service.Object):
                         player_metadata.append((target, value))
                     continue
 
-                try:
-                    self.vumap[key].set_meter_value(value)
-                except KeyError:
-                    pass
-                    # print "key value", key, "missing from vumap"
+                meter = vumap.get(key)
+                if meter is not None:
+                    meter.set_meter_value(value)
 
             if self.jingles.playing is True and \
                     int(self.jingles_playing) == 0:
@@ -3014,13 +3351,13 @@ class MainWindow(dbus.service.Object):
         if command == "saveandquit":
             self.destroy()
 
-    @threadslock
     def stats_update(self):
         players = self.player_left, self.player_right, self.jingles.interlude
         for player in players:
             if player.player_is_playing:
                 player.check_mixer_signal()
-            elif player.pl_mode.get_active() == 0:
+            elif self._main_visible and player.pl_mode.get_active() == 0:
+                # Block times are only displayed, skip them while hidden.
                 player.update_time_stats()
 
         ch = self.mic_opener.mic_list
@@ -3050,6 +3387,10 @@ class MainWindow(dbus.service.Object):
 
         self.controls.input_key(event)
 
+    def cb_window_state(self, widget, event):
+        self._main_visible = not event.new_window_state & (
+            Gdk.WindowState.ICONIFIED | Gdk.WindowState.WITHDRAWN)
+
     def configure_event(self, widget, event):
         if self.player_left.is_playing:
             self.player_left.reselect_cursor_please = True
@@ -3069,7 +3410,8 @@ class MainWindow(dbus.service.Object):
             widget.forall(self.strip_focusability)
         except AttributeError:
             pass
-        widget.set_can_focus(False)
+        if widget not in self._keep_focus:
+            widget.set_can_focus(False)
 
     class initfailed(Exception):
 
@@ -3162,6 +3504,18 @@ class MainWindow(dbus.service.Object):
         print("jack client ID:", client_id)
 
         self.session_loaded = False
+        self._flush_drain = None
+        self._mixer_stats_resend = False
+        self._last_mixr = None
+        self._last_links = None
+        self._save_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._callback_handlers = {
+            "Show about": self._callback_show_about,
+            "Features": self._callback_features,
+            "Advance": self._callback_advance,
+            "pass-crossfader": self._callback_pass_crossfader,
+            "Clear History": self._callback_clear_history,
+        }
 
         try:
             self.backend = ctypes.CDLL(FGlobs.backend)
@@ -3190,6 +3544,8 @@ class MainWindow(dbus.service.Object):
         self.window_group.add_window(self.window)
         self.window.set_title(self.appname + pm.title_extra)
         self.window.connect("delete_event", self.delete_event)
+        self._main_visible = False
+        self.window.connect("window-state-event", self.cb_window_state)
         self.hbox10 = Gtk.Box(homogeneous=False)
         self.hbox10.set_spacing(6)
         self.paned = Gtk.HPaned()
@@ -3275,9 +3631,8 @@ class MainWindow(dbus.service.Object):
         phonebox.viewlevels = (5,)
         phonebox.set_spacing(2)
 
-        pixbuf4 = GdkPixbuf.Pixbuf.new_from_file(
-            FGlobs.pkgdatadir / "greenphone.png")
-        pixbuf4 = pixbuf4.scale_simple(25, 20, GdkPixbuf.InterpType.BILINEAR)
+        pixbuf4 = _load_pixbuf(
+            FGlobs.pkgdatadir / "greenphone.png", 25, 20, False)
         image = Gtk.Image()
         image.set_from_pixbuf(pixbuf4)
         image.show()
@@ -3290,10 +3645,8 @@ class MainWindow(dbus.service.Object):
             self.greenphone,
             _('Mix voice over IP audio to the output stream.'))
 
-        pixbuf5 = GdkPixbuf.Pixbuf.new_from_file(
-            FGlobs.pkgdatadir / "redphone.png"
-        )
-        pixbuf5 = pixbuf5.scale_simple(25, 20, GdkPixbuf.InterpType.BILINEAR)
+        pixbuf5 = _load_pixbuf(
+            FGlobs.pkgdatadir / "redphone.png", 25, 20, False)
         image = Gtk.Image()
         image.set_from_pixbuf(pixbuf5)
         image.show()
@@ -3319,10 +3672,8 @@ class MainWindow(dbus.service.Object):
         self.mic_opener.show()
 
         # playlist advance button
-        pixbuf = GdkPixbuf.Pixbuf.new_from_file(
-            FGlobs.pkgdatadir / "advance.png"
-        )
-        pixbuf = pixbuf.scale_simple(32, 14, GdkPixbuf.InterpType.BILINEAR)
+        pixbuf = _load_pixbuf(
+            FGlobs.pkgdatadir / "advance.png", 32, 14, False)
         image = Gtk.Image()
         image.set_from_pixbuf(pixbuf)
         self.advance = Gtk.Button()
@@ -3402,25 +3753,21 @@ class MainWindow(dbus.service.Object):
         self.voipgainvbox = Gtk.VBox()
         self.voipgainvbox.set_spacing(1)
         self.voiplevsbox.pack_start(self.voipgainvbox, False, False, 0)
-        self.voipgainvbox.show()
 
-        pixbuf = GdkPixbuf.Pixbuf.new_from_file(
-            FGlobs.pkgdatadir / "greenphone.png"
-        )
-        pixbuf = pixbuf.scale_simple(20, 17, GdkPixbuf.InterpType.HYPER)
+        pixbuf = _load_pixbuf(
+            FGlobs.pkgdatadir / "greenphone.png", 20, 17, False)
         greenphoneimage = Gtk.Image()
         greenphoneimage.set_from_pixbuf(pixbuf)
         self.voipgainvbox.pack_start(greenphoneimage, False, False, 0)
-        greenphoneimage.show()
 
-        self.voipgainadj = Gtk.Adjustment(64.0, 0.0, 127.0, 1.0, 6.0)
+        self.voipgainadj = make_level_adjustment()
         self.voipgainadj.connect("value_changed", self.cb_deckvol)
         voipgain = Gtk.VScale(adjustment=self.voipgainadj)
         # voipgain.set_update_policy(Gtk.UPDATE_CONTINUOUS)
         voipgain.set_draw_value(False)
         voipgain.set_inverted(True)
         self.voipgainvbox.pack_start(voipgain, True, True, 0)
-        voipgain.show()
+        self.voipgainvbox.show_all()
         set_tip(
             self.voipgainvbox,
             _('VoIP level adjustment. 0dB gain is at the mid point.'))
@@ -3428,28 +3775,21 @@ class MainWindow(dbus.service.Object):
         self.mixbackvbox = Gtk.VBox()
         self.mixbackvbox.set_spacing(1)
         self.voiplevsbox.pack_start(self.mixbackvbox, False, False, 0)
-        self.mixbackvbox.show()
 
-        pixbuf = GdkPixbuf.Pixbuf.new_from_file(
-            FGlobs.pkgdatadir / "pbphone.png"
-        )
-        pixbuf = pixbuf.scale_simple(20, 17, GdkPixbuf.InterpType.HYPER)
+        pixbuf = _load_pixbuf(
+            FGlobs.pkgdatadir / "pbphone.png", 20, 17, False)
         pbphoneimage = Gtk.Image()
         pbphoneimage.set_from_pixbuf(pixbuf)
         self.mixbackvbox.pack_start(pbphoneimage, False, False, 0)
-        pbphoneimage.show()
-        pbphoneimage.set_from_pixbuf(pixbuf)
-        self.mixbackvbox.pack_start(pbphoneimage, False, False, 0)
-        pbphoneimage.show()
 
-        self.mixbackadj = Gtk.Adjustment(64.0, 0.0, 127.0, 1.0, 6.0)
+        self.mixbackadj = make_level_adjustment()
         self.mixbackadj.connect("value_changed", self.cb_deckvol)
         mixback = Gtk.VScale(adjustment=self.mixbackadj)
         # mixback.set_update_policy(Gtk.UPDATE_CONTINUOUS)
         mixback.set_draw_value(False)
         mixback.set_inverted(True)
         self.mixbackvbox.pack_start(mixback, True, True, 0)
-        mixback.show()
+        self.mixbackvbox.show_all()
         set_tip(
             self.mixbackvbox,
             _('The stream volume level to send to '
@@ -3542,6 +3882,14 @@ class MainWindow(dbus.service.Object):
         self.history_textview.set_editable(False)
         self.history_textview.set_wrap_mode(Gtk.WrapMode.CHAR)
         self.history_buffer = self.history_textview.get_buffer()
+        self._history_pending = []
+        # Line buffered so each entry reaches the disk as it is written.
+        try:
+            self._history_fh = open(
+                pm.basedir / "history.log", "a", buffering=1)
+        except IOError:
+            print("failed to open history.log")
+            self._history_fh = None
 
         self.abox = Gtk.Box()
         self.abox.viewlevels = (5,)
@@ -3573,14 +3921,7 @@ class MainWindow(dbus.service.Object):
 
         smvbox = Gtk.VBox()
         label = Gtk.Label(label=_('Monitor Mix'))
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                _('Monitor')
-            ),
-            -1,
-            "0")[1]
-        label.set_attributes(attrlist)
+        label.set_attributes(_markup_attrs(METER_TEXT_SIZE, _('Monitor')))
         smvbox.add(label)
         label.show()
 
@@ -3624,29 +3965,26 @@ class MainWindow(dbus.service.Object):
         mvbox = Gtk.VBox()
         # TC: Dropdown box title text widget.
         label = Gtk.Label(label=_('Metadata Source'))
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                _('Metadata')
-            ),
-            -1,
-            "0")[1]
-        label.set_attributes(attrlist)
+        label.set_attributes(_markup_attrs(METER_TEXT_SIZE, _('Metadata')))
         mvbox.add(label)
         label.show()
-        self.metadata_source = Gtk.ComboBoxText()
-        # TC: The chosen source of track metadata.
-        self.metadata_source.append_text(_('Playlist 1'))
-        # TC: The chosen source of track metadata.
-        self.metadata_source.append_text(_('Playlist 2'))
-        # TC: The chosen source of track metadata.
-        self.metadata_source.append_text(_('Last Played'))
-        # TC: The chosen source of track metadata.
-        self.metadata_source.append_text(_('Crossfader'))
-        # TC: The chosen source of track metadata. In this case no metadata.
-        self.metadata_source.append_text(_('None'))
-        # TC: The chosen source of track metadata. In this case no metadata.
-        self.metadata_source.append_text(_('Playlist 3'))
+        metadata_store = Gtk.ListStore(str, str)
+        for row in (
+                # TC: The chosen source of track metadata.
+                _('Playlist 1'),
+                # TC: The chosen source of track metadata.
+                _('Playlist 2'),
+                # TC: The chosen source of track metadata.
+                _('Last Played'),
+                # TC: The chosen source of track metadata.
+                _('Crossfader'),
+                # TC: The chosen source of track metadata. In this case no
+                # metadata.
+                _('None'),
+                # TC: The chosen source of track metadata.
+                _('Playlist 3')):
+            metadata_store.append((row, None))
+        self.metadata_source = Gtk.ComboBoxText(model=metadata_store)
         self.metadata_source.set_active(3)
         cross_sizegroup.add_widget(self.metadata_source)
         self.metadata_source.connect("changed", self.cb_metadata_source)
@@ -3664,17 +4002,7 @@ class MainWindow(dbus.service.Object):
 
         plvbox = Gtk.VBox()
         # TC: Abbreviation of left.
-        label = Gtk.Label(label=_('L'))
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                _('L')
-            ),
-            -1,
-            "0")[1]
-        label.set_attributes(attrlist)
-        plvbox.add(label)
-        label.show()
+        make_meter_label(plvbox, _('L'))
         self.passleft = make_arrow_button(
             self,
             Gtk.ArrowType.LEFT,
@@ -3682,49 +4010,27 @@ class MainWindow(dbus.service.Object):
             "cfmleft"
         )
         plvbox.add(self.passleft)
-        self.passleft.show()
         self.crossbox.pack_start(plvbox, False, False, 0)
-        plvbox.show()
+        plvbox.show_all()
         set_tip(plvbox, _('Move the crossfader fully left.'))
         sg3.add_widget(self.passleft)
 
         self.crossadj = Gtk.Adjustment(0.0, 0.0, 100.0, 1.0, 3.0, 0.0)
         self.crossadj.connect("value_changed", self.cb_crossfade)
         cvbox = Gtk.VBox()
-        label = Gtk.Label(label=_('Crossfader'))
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                _('Crossfader')
-            ),
-            -1,
-            "0")[1]
-        label.set_attributes(attrlist)
-        cvbox.add(label)
-        label.show()
+        make_meter_label(cvbox, _('Crossfader'))
         self.crossfade = Gtk.HScale(adjustment=self.crossadj)
         # self.crossfade.set_update_policy(Gtk.UPDATE_CONTINUOUS)
         self.crossfade.set_draw_value(False)
         cvbox.add(self.crossfade)
-        self.crossfade.show()
         self.crossbox.pack_start(cvbox, True, True, 0)
-        cvbox.show()
+        cvbox.show_all()
         self.vbox6.pack_start(self.outercrossbox, False, False, 2)
         set_tip(cvbox, _('The crossfader.'))
 
         prvbox = Gtk.VBox()
         # TC: Abbreviation of right.
-        label = Gtk.Label(label=_('R'))
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                _('R')
-            ),
-            -1,
-            "0")[1]
-        label.set_attributes(attrlist)
-        prvbox.add(label)
-        label.show()
+        make_meter_label(prvbox, _('R'))
         self.passright = make_arrow_button(
             self,
             Gtk.ArrowType.RIGHT,
@@ -3732,9 +4038,8 @@ class MainWindow(dbus.service.Object):
             "cfmright"
         )
         prvbox.add(self.passright)
-        self.passright.show()
         self.crossbox.pack_start(prvbox, False, False, 0)
-        prvbox.show()
+        prvbox.show_all()
         set_tip(prvbox, _('Move the crossfader fully right.'))
         sg3.add_widget(self.passright)
 
@@ -3745,28 +4050,14 @@ class MainWindow(dbus.service.Object):
         passbox = Gtk.VBox()
         # TC: Describes a mid point.
         label = Gtk.Label(label=_('Middle'))
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                _('Middle')
-            ),
-            -1,
-            "0")[1]
-        label.set_attributes(attrlist)
-        label.show()
-        # TC: Describes a mid point.
-        label = Gtk.Label(label=_('Middle'))
         attrlist = Pango.AttrList()
         #attrlist.insert(Pango.AttrSize(8000, 0, len(_('Middle'))))
         label.set_attributes(attrlist)
-        label.show()
         passbox.add(label)
         passhbox = Gtk.Box()
         passhbox.set_spacing(2)
         passbox.add(passhbox)
-        passhbox.show()
         patternbox.pack_start(passbox, False, False, 0)
-        passbox.show()
 
         self.passmidleft = make_arrow_button(
             self,
@@ -3776,7 +4067,6 @@ class MainWindow(dbus.service.Object):
         )
         sg4.add_widget(self.passmidleft)
         passhbox.pack_start(self.passmidleft, False, False, 0)
-        self.passmidleft.show()
         set_tip(
             self.passmidleft,
             _('Move the crossfader to the '
@@ -3789,7 +4079,6 @@ class MainWindow(dbus.service.Object):
             "cfmmidr"
         )
         passhbox.pack_start(self.passmidright, False, False, 0)
-        self.passmidright.show()
         set_tip(self.passmidright,
                 _('Move the crossfader to the middle of its range of travel.'))
         sg4.add_widget(self.passmidright)
@@ -3797,37 +4086,17 @@ class MainWindow(dbus.service.Object):
         pvbox = Gtk.VBox()
         # TC: The attenuation response curve of the crossfader.
         # User selectable.
-        label = Gtk.Label(label=_('Response'))
-        label.set_attributes(
-            Pango.parse_markup(
-                '<span size="{}">{}</span>'.format(
-                    METER_TEXT_SIZE,
-                    _('Response')
-                ),
-                -1,
-                "0")[1]
-        )
-        pvbox.add(label)
-        label.show()
+        make_meter_label(pvbox, _('Response'))
         liststore = Gtk.ListStore(GdkPixbuf.Pixbuf)
         self.crosspattern = Gtk.ComboBox()
         self.crosspattern.set_model(liststore)
         cell = Gtk.CellRendererPixbuf()
         self.crosspattern.pack_start(cell, True)
         self.crosspattern.add_attribute(cell, 'pixbuf', 0)
-        liststore.append(
-            (GdkPixbuf.Pixbuf.new_from_file(
-                FGlobs.pkgdatadir / "classic_cross.png"), ))
-        liststore.append(
-            (GdkPixbuf.Pixbuf.new_from_file(
-                FGlobs.pkgdatadir / "mk2_cross.png"), ))
-        liststore.append(
-            (GdkPixbuf.Pixbuf.new_from_file(
-                FGlobs.pkgdatadir / "pat3.png"), ))
+        for each in ("classic_cross.png", "mk2_cross.png", "pat3.png"):
+            liststore.append((_load_pixbuf(FGlobs.pkgdatadir / each), ))
         pvbox.pack_start(self.crosspattern, True, True, 0)
-        self.crosspattern.show()
         self.crossbox.pack_start(patternbox, False, False, 0)
-        patternbox.show()
         cross_sizegroup2.add_widget(patternbox)
         self.crosspattern.set_active(0)
         self.crosspattern.connect("changed", self.cb_crosspattern)
@@ -3840,7 +4109,7 @@ class MainWindow(dbus.service.Object):
         )
 
         patternbox.pack_start(pvbox, True, True, 0)
-        pvbox.show()
+        patternbox.show_all()
 
         sg4.add_widget(self.crosspattern)
 
@@ -3849,34 +4118,20 @@ class MainWindow(dbus.service.Object):
 
         tvbox = Gtk.VBox()
         # TC: Duration in seconds.
-        label = Gtk.Label(label=_('Time'))
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                _('Time')
-            ),
-            -1,
-            "0")[1]
-        label.set_attributes(attrlist)
-        tvbox.add(label)
-        label.show()
+        make_meter_label(tvbox, _('Time'))
         self.passspeed_adj = Gtk.Adjustment(1.0, 0.25, 20.0, 0.25, 0.25)
         psvbox = Gtk.VBox()
         hs = Gtk.HSeparator()
         psvbox.pack_start(hs, False, False, 0)
-        hs.show()
         self.passspeed = Gtk.SpinButton(
             adjustment=self.passspeed_adj,
             climb_rate=0,
             digits=2
         )
         psvbox.pack_start(self.passspeed, True, False, 0)
-        self.passspeed.show()
         hs = Gtk.HSeparator()
         psvbox.pack_start(hs, False, False, 0)
-        hs.show()
         tvbox.pack_start(psvbox, False, False, 0)
-        psvbox.show()
         set_tip(
             tvbox,
             _('The time in seconds that the crossfader will take to'
@@ -3884,32 +4139,20 @@ class MainWindow(dbus.service.Object):
               'right is clicked.')
         )
         passbox.pack_start(tvbox, False, False, 0)
-        tvbox.show()
         sg4.add_widget(psvbox)
 
         pvbox = Gtk.VBox()
         # TC: The crossfader pass-across button text.
         # TC: The actual button appears as [<-->] with this text above it.
-        label = Gtk.Label(label=_('Pass'))
-        attrlist = Pango.parse_markup(
-            '<span size="{}">{}</span>'.format(
-                METER_TEXT_SIZE,
-                _('Pass')
-            ),
-            -1,
-            "0")[1]
-        label.set_attributes(attrlist)
-        pvbox.add(label)
-        label.show()
+        make_meter_label(pvbox, _('Pass'))
         image = Gtk.Image()
-        image.set_from_file(FGlobs.pkgdatadir / "pass.png")
-        image.show()
+        image.set_from_pixbuf(
+            _load_pixbuf(FGlobs.pkgdatadir / "pass.png"))
         self.passbutton = Gtk.Button()
         self.passbutton.set_size_request(53, -1)
         self.passbutton.add(image)
         self.passbutton.connect("clicked", self.callback, "pass-crossfader")
         pvbox.add(self.passbutton)
-        self.passbutton.show()
         set_tip(
             pvbox,
             _('This button causes the crossfader to move to the '
@@ -3917,12 +4160,11 @@ class MainWindow(dbus.service.Object):
               ' selector to the left.')
         )
         passbox.pack_start(pvbox, True, True, 0)
-        pvbox.show()
         sg4.add_widget(self.passbutton)
 
         self.crossbox.pack_start(passbox, False, False, 0)
         cross_sizegroup.add_widget(passbox)
-        passbox.show()
+        passbox.show_all()
         self.crossbox.show()
 
         abox = Gtk.Box()
@@ -3967,10 +4209,8 @@ class MainWindow(dbus.service.Object):
         )
 
         sg = Gtk.SizeGroup(Gtk.SizeGroupMode.HORIZONTAL)
-        self.stream_indicator = []
-
-        for i in range(PGlobs.num_streamers):
-            self.stream_indicator.append(StreamMeter(1, 100))
+        self.stream_indicator = [
+            StreamMeter(1, 100) for i in range(PGlobs.num_streamers)]
 
         self.stream_indicator_box, self.listener_indicator = \
             make_stream_meter_unit(_('Streams'), self.stream_indicator)
@@ -4001,8 +4241,9 @@ class MainWindow(dbus.service.Object):
         set_tip(stream_vu_box, _('A VU meter for the stream audio.'))
 
         # TC: Appears above the mic meters as a label followed by a number.
+        channel_text = _("Ch")
         self.mic_meters = [
-            MicMeter(_("Ch"), i)
+            MicMeter(channel_text, i)
             for i in range(1, PGlobs.num_micpairs * 2 + 1)
         ]
         if len(self.mic_meters) <= 4:
@@ -4013,25 +4254,16 @@ class MainWindow(dbus.service.Object):
             chvbox = Gtk.VBox()
             chvbox.set_spacing(4)
             self.micmeterbox.pack_start(chvbox, True, True, 0)
-            chvbox.show()
-
-            def showhide(widget, state, box, l, r):
-                # if l.flags() & Gtk.SENSITIVE or r.flags() & Gtk.SENSITIVE:
-                if l.is_sensitive() or r.is_sensitive():
-                    box.show()
-                else:
-                    box.hide()
-
-            for l, r in zip(*((iter(self.mic_meters),) * 2)):
+            for l, r in zip(self.mic_meters[::2], self.mic_meters[1::2]):
                 chhbox = Gtk.Box()
                 chhbox.set_spacing(4)
                 chhbox.pack_start(l, False, False, 0)
                 chhbox.pack_end(r, False, False, 0)
                 chvbox.pack_start(chhbox, True, True, 0)
-                chhbox.show()
                 for each in l, r:
-                    each.connect("state-changed", showhide, chhbox, l, r)
-                    each.show()
+                    each.connect("state-changed", _meter_pair_showhide,
+                                 chhbox, l, r)
+            chvbox.show_all()
 
         set_tip(
             self.micmeterbox,
@@ -4055,6 +4287,7 @@ class MainWindow(dbus.service.Object):
         self.showing_right_file_requester = False
         self.old_metadata = None
         self._old_metadata_2 = None
+        self._songname_keys = {}
         self.simplemixer = False
         self.crosspass = 0
         self.old_meta_context = None
@@ -4062,52 +4295,28 @@ class MainWindow(dbus.service.Object):
 
         # initialize metadata source setting
         self.last_player = ""
-        self.METADATA_LEFT_DECK = 0
-        self.METADATA_RIGHT_DECK = 1
-        self.METADATA_LAST_PLAYED = 2
-        self.METADATA_CROSSFADER = 3
-        self.METADATA_NONE = 4
-        self.METADATA_BACKGROUND = 5
+        self._meta_dispatch = {
+            self.METADATA_LEFT_DECK: lambda: 0,
+            self.METADATA_RIGHT_DECK: lambda: 1,
+            self.METADATA_LAST_PLAYED:
+                lambda: 0 if self.last_player == "left" else 1,
+            self.METADATA_CROSSFADER:
+                lambda: 0 if self.crossadj.get_value() < 50 else 1,
+            self.METADATA_NONE: lambda: -1,
+            self.METADATA_BACKGROUND: lambda: 2
+        }
         self.metadata_src = self.METADATA_CROSSFADER
 
         self.alarm = False
-        self.NO_PHONE = 0
-        self.PUBLIC_PHONE = 1
-        self.PRIVATE_PHONE = 2
         self.mixermode = self.NO_PHONE
-        self.jingles_playing = SlotObject(0)
-        self.interlude_playing = SlotObject(0)
-        self.player_left.playtime_elapsed = SlotObject(0)
-        self.player_right.playtime_elapsed = SlotObject(0)
-        self.jingles.interlude.playtime_elapsed = SlotObject(0)
-        self.player_left.mixer_playing = SlotObject(0)
-        self.player_right.mixer_playing = SlotObject(0)
-        self.jingles.interlude.mixer_playing = SlotObject(0)
-        self.player_left.mixer_signal_f = SlotObject(0)
-        self.player_right.mixer_signal_f = SlotObject(0)
-        self.jingles.interlude.mixer_signal_f = SlotObject(0)
-        self.player_left.mixer_cid = SlotObject(0)
-        self.player_right.mixer_cid = SlotObject(0)
-        self.jingles.interlude.mixer_cid = SlotObject(0)
-        self.left_compression_level = SlotObject(0)
-        self.right_compression_level = SlotObject(0)
-        self.left_deess_level = SlotObject(0)
-        self.right_deess_level = SlotObject(0)
-        self.left_noisegate_level = SlotObject(0)
-        self.right_noisegate_level = SlotObject(0)
-        self.jingles.mixer_jingles_cid = SlotObject(0)
-        self.jingles.mixer_interlude_cid = SlotObject(0)
-        self.player_left.runout = SlotObject(0)
-        self.player_right.runout = SlotObject(0)
-        self.jingles.interlude.runout = SlotObject(0)
-        self.metadata_left_ctrl = SlotObject(0)
-        self.metadata_right_ctrl = SlotObject(0)
-        self.metadata_interlude_ctrl = SlotObject(0)
-        self.player_left.silence = SlotObject(0.0)
-        self.player_right.silence = SlotObject(0.0)
-        self.jingles.interlude.silence = SlotObject(0.0)
-        self.sample_rate = SlotObject(0)
-        self.effects_playing = SlotObject(0)
+        self.vumap = {}
+        for path, value, key in MIXER_SLOTS:
+            owner, name = path.rpartition(".")[::2]
+            owner = operator.attrgetter(owner)(self) if owner else self
+            slot = SlotObject(value)
+            setattr(owner, name, slot)
+            if key is not None:
+                self.vumap[key] = slot
         self.channel_states = [-1, ] * 12
         self.dbus_voip_mode = -1
 
@@ -4125,41 +4334,10 @@ class MainWindow(dbus.service.Object):
         self.files_played_offline = {}
 
         # Variable map for stuff read from the mixer
-        self.vumap = {
-            "str_l_peak": self.str_l_peak,
-            "str_r_peak": self.str_r_peak,
-            "str_l_rms": self.str_l_rms_vu,
-            "str_r_rms": self.str_r_rms_vu,
-            "left_elapsed": self.player_left.playtime_elapsed,
-            "right_elapsed": self.player_right.playtime_elapsed,
-            "interlude_elapsed": self.jingles.interlude.playtime_elapsed,
-            "left_playing": self.player_left.mixer_playing,
-            "right_playing": self.player_right.mixer_playing,
-            "jingles_playing": self.jingles_playing,
-            "interlude_playing": self.jingles.interlude.mixer_playing,
-            "left_signal": self.player_left.mixer_signal_f,
-            "right_signal": self.player_right.mixer_signal_f,
-            "interlude_signal": self.jingles.interlude.mixer_signal_f,
-            "left_cid": self.player_left.mixer_cid,
-            "right_cid": self.player_right.mixer_cid,
-            "jingles_cid": self.jingles.mixer_jingles_cid,
-            "interlude_cid": self.jingles.interlude.mixer_cid,
-            "left_audio_runout": self.player_left.runout,
-            "right_audio_runout": self.player_right.runout,
-            "interlude_audio_runout": self.jingles.interlude.runout,
-            "left_additional_metadata": self.metadata_left_ctrl,
-            "right_additional_metadata": self.metadata_right_ctrl,
-            "interlude_additional_metadata": self.metadata_interlude_ctrl,
-            "left_silence": self.player_left.silence,
-            "right_silence": self.player_right.silence,
-            "interlude_silence": self.jingles.interlude.silence,
-            "sample_rate": self.sample_rate,
-            "effects_playing": self.effects_playing,
-            "freewheel_mode": self.freewheel_button
-        }
-
-        for i, mic in enumerate(self.mic_meters):
-            self.vumap.update({"mic_%d_levels" % (i + 1): mic})
+        self.vumap.update((key, operator.attrgetter(path)(self))
+                          for key, path in VUMAP_WIDGETS)
+        self.vumap.update(("mic_%d_levels" % i, mic)
+                          for i, mic in enumerate(self.mic_meters, 1))
 
         self.controls = midicontrols.Controls(self)
         self.controls.load_prefs()
@@ -4216,13 +4394,15 @@ class MainWindow(dbus.service.Object):
         self.prefs_window.load_player_prefs()
         self.prefs_window.apply_player_prefs()
 
-        self.vutimeout = timeout_add(50, self.vu_update)
-        self.statstimeout = timeout_add(100, self.stats_update)
+        # Levels every tick, player stats every 2nd, heartbeat every 20th.
+        self._tick = 0
+        self.ticktimeout = timeout_add(50, self._cb_tick)
 
         self.savetimeout = timeout_add_seconds(
             120,
             threadslock(self.save_session),
-            "periodic"
+            "periodic",
+            priority=GLib.PRIORITY_LOW
         )
 
         # DBus object initialization
@@ -4232,11 +4412,11 @@ class MainWindow(dbus.service.Object):
             PGlobs.dbus_objects_basename + "/main"
         )
 
+        # Delivered by the main loop itself, so no Python handler has to
+        # wait for the interpreter to regain control from Gtk.main.
         for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
-            signal.signal(
-                sig,
-                lambda s, f: idle_add(threadslock(self.destroy))
-            )
+            GLib.unix_signal_add(GLib.PRIORITY_HIGH, sig,
+                                 self._cb_quit_signal)
 
         (self.full_wst, self.min_wst)[bool(self.simplemixer)].apply()
         self.window.connect("configure_event", self.configure_event)
@@ -4260,11 +4440,13 @@ class MainWindow(dbus.service.Object):
 
         self.server_window.update_metadata()
 
+        self._keep_focus = {
+            self.player_left.treeview,
+            self.player_right.treeview,
+            self.jingles.interlude.treeview
+        }
         self.window.forall(self.strip_focusability)
         self.topleftpane.repair_focusability()
-        self.player_left.treeview.set_can_focus(True)
-        self.player_right.treeview.set_can_focus(True)
-        self.jingles.interlude.treeview.set_can_focus(True)
         self.player_left.treeview.grab_focus()
 
         self.window.add_events(Gdk.EventMask.KEY_PRESS_MASK)
@@ -4272,10 +4454,6 @@ class MainWindow(dbus.service.Object):
         self.window.connect("key-release-event", self.cb_key_capture)
 
         self.window.show()
-        idle_add(lambda: self.prefs_window.window.realize() and False)
-
-        self.player_left.treeview.emit("cursor-changed")
-        self.player_right.treeview.emit("cursor-changed")
 
         try:
             if args.channels is not None:
@@ -4297,10 +4475,9 @@ class MainWindow(dbus.service.Object):
 
             if args.kicksources is not None:
                 servtabs = self.server_window.streamtabframe.tabs
-                for n in range(len(servtabs)):
-                    if chr(n + ord("1")) in args.kicksources:
-                        servtabs[n].kick_incumbent.clicked()
-                time.sleep(0.1)
+                for n, tab in enumerate(servtabs, 1):
+                    if str(n) in args.kicksources:
+                        tab.kick_incumbent.clicked()
         except:
             pass
 
@@ -1581,6 +1581,8 @@ class IDJC_Media_Player:
             fh = open(PM.basedir / self.session_filename, "r")
         except:
             return
+        detached = False
+        select = None
         while 1:
             try:
                 line = fh.readline()
@@ -1615,6 +1617,10 @@ class IDJC_Media_Player:
                 if line.startswith("fade_mode="):
                     self.pl_delay.set_active(int(line[10]))
                 if line.startswith("pe="):
+                    if not detached:
+                        # Rows go in faster with the view out of the way.
+                        self.treeview.set_model(None)
+                        detached = True
                     playlist_entry = self.pl_unpack(line[3:])
                     # Links directory entries conversion to absolute path.
                     if playlist_entry[1] and \
@@ -1631,14 +1637,17 @@ class IDJC_Media_Player:
                         except TypeError:
                             self.playlist_todo.append(playlist_entry.filename)
                 if line.startswith("select="):
-                    path = line[7:-1]
-                    try:
-                        self.treeview.get_selection().select_path(path)
-                        self.treeview.scroll_to_cell(path, None, False)
-                    except:
-                        pass
+                    select = line[7:-1]
             except ValueError:
                 pass
+        if detached:
+            self.treeview.set_model(self.liststore)
+        if select is not None:
+            try:
+                self.treeview.get_selection().select_path(select)
+                self.treeview.scroll_to_cell(select, None, False)
+            except:
+                pass
         if self.playlist_todo:
             print(
                 self.playername + (